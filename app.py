@@ -15,7 +15,7 @@ from pathlib import Path
 from core import AIEngine, CodeGenerator, TestGenerator, ErrorHandler, DeployChecker
 from utils.file_manager import FileManager
 from utils.code_analyzer import CodeAnalyzer
-from utils.templates import TemplateManager
+from utils.templates import get_template_manager
 
 # Page configuration
 st.set_page_config(
@@ -105,7 +105,7 @@ def initialize_components():
         'deploy_checker': DeployChecker(),
         'file_manager': FileManager(),
         'code_analyzer': CodeAnalyzer(),
-        'template_manager': TemplateManager()
+        'template_manager': get_template_manager()
     }
 
 components = initialize_components()
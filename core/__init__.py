@@ -1,12 +1,24 @@
 """
 Core module for AI-powered development assistant.
+
+Components are imported on first access, so importing one of them does not
+pay for the others (AIEngine alone pulls in the OpenAI and Gemini SDKs).
 """
 
-from .ai_engine import AIEngine
-from .code_generator import CodeGenerator
-from .test_generator import TestGenerator
-from .error_handler import ErrorHandler
-from .deploy_checker import DeployChecker
+import importlib
+
+from dotenv import load_dotenv
+
+# Components read their settings from the environment when constructed
+load_dotenv()
+
+_COMPONENTS = {
+    'AIEngine': '.ai_engine',
+    'CodeGenerator': '.code_generator',
+    'TestGenerator': '.test_generator',
+    'ErrorHandler': '.error_handler',
+    'DeployChecker': '.deploy_checker'
+}
 
 __all__ = [
     'AIEngine',
@@ -14,4 +26,11 @@ __all__ = [
     'TestGenerator',
     'ErrorHandler',
     'DeployChecker'
-] 
\ No newline at end of file
+]
+
+def __getattr__(name):
+    if name in _COMPONENTS:
+        value = getattr(importlib.import_module(_COMPONENTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
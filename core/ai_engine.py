@@ -4,7 +4,7 @@ AI Engine for handling multiple AI models (OpenAI and Gemini).
 
 import os
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator, Tuple
 import openai
 import google.generativeai as genai
 from dotenv import load_dotenv
@@ -97,47 +97,69 @@ class AIEngine:
     def generate_response(self, prompt: str, model: str = None) -> str:
         """Generate a general response using the specified or default model."""
         try:
-            # Try OpenAI first if specified or as default
-            if (model and model.startswith('gpt')) or (not model and self.default_model.startswith('gpt')):
-                if self.openai_client:
-                    model_to_use = model if model and model.startswith('gpt') else self.default_model
-                    response = self.openai_client.chat.completions.create(
-                        model=model_to_use,
-                        messages=[{"role": "user", "content": prompt}],
-                        max_tokens=self.max_tokens,
-                        temperature=self.temperature
-                    )
-                    return response.choices[0].message.content
-                else:
-                    logging.warning("OpenAI client not available, trying Gemini")
-            
-            # Try Gemini if specified or as fallback
-            if (model and 'gemini' in model.lower()) or (not model and self.gemini_model):
-                if self.gemini_model:
-                    response = self.gemini_model.generate_content(prompt)
-                    return response.text
-                else:
-                    logging.warning("Gemini model not available")
-            
-            # If no specific model requested, try default
-            if self.default_model.startswith('gpt') and self.openai_client:
+            backend, model_to_use = self._select_backend(model)
+            if backend == "openai":
                 response = self.openai_client.chat.completions.create(
-                    model=self.default_model,
+                    model=model_to_use,
                     messages=[{"role": "user", "content": prompt}],
                     max_tokens=self.max_tokens,
                     temperature=self.temperature
                 )
                 return response.choices[0].message.content
-            elif self.gemini_model:
-                response = self.gemini_model.generate_content(prompt)
-                return response.text
             
-            raise Exception("No AI models available")
+            response = self.gemini_model.generate_content(prompt)
+            return response.text
             
         except Exception as e:
             logging.error(f"Error generating response: {e}")
             return f"Error generating response: {str(e)}"
     
+    def generate_response_stream(self, prompt: str, model: str = None) -> Iterator[str]:
+        """Like generate_response, but yield the response in chunks as they arrive."""
+        try:
+            backend, model_to_use = self._select_backend(model)
+            if backend == "openai":
+                stream = self.openai_client.chat.completions.create(
+                    model=model_to_use,
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=self.max_tokens,
+                    temperature=self.temperature,
+                    stream=True
+                )
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+                return
+            
+            for chunk in self.gemini_model.generate_content(prompt, stream=True):
+                yield chunk.text
+            
+        except Exception as e:
+            logging.error(f"Error generating response: {e}")
+            yield f"Error generating response: {str(e)}"
+    
+    def _select_backend(self, model: Optional[str]) -> Tuple[str, Optional[str]]:
+        """Pick "openai" (with the model name) or "gemini" for a response request."""
+        # Try OpenAI first if specified or as default
+        if (model and model.startswith('gpt')) or (not model and self.default_model.startswith('gpt')):
+            if self.openai_client:
+                return "openai", model if model and model.startswith('gpt') else self.default_model
+            logging.warning("OpenAI client not available, trying Gemini")
+        
+        # Try Gemini if specified or as fallback
+        if (model and 'gemini' in model.lower()) or (not model and self.gemini_model):
+            if self.gemini_model:
+                return "gemini", None
+            logging.warning("Gemini model not available")
+        
+        # If no specific model requested, try default
+        if self.default_model.startswith('gpt') and self.openai_client:
+            return "openai", self.default_model
+        elif self.gemini_model:
+            return "gemini", None
+        
+        raise Exception("No AI models available")
+    
     def _create_code_prompt(self, requirement: str, language: str) -> str:
         """Create prompt for code generation."""
         return f"""
@@ -3,39 +3,103 @@ Code Generator module for creating production-ready code.
 """
 
 import os
+import sys
+import copy
+import json
 import logging
+import threading
 import subprocess
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 import black
 import ast
 
+FLAKE8_WORKER = Path(__file__).with_name("flake8_worker.py")
+FLAKE8_ARGS = ['--max-line-length=88']
+GENERATE_CACHE_SIZE = 512
+
 class CodeGenerator:
     """Handles code generation, formatting, and validation."""
     
     def __init__(self):
         self.output_dir = os.getenv('GENERATED_CODE_DIR', 'generated/code')
+        self._flake8_worker = None
+        self._flake8_lock = threading.Lock()
+        self._generate_cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         self._ensure_output_dir()
     
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            # Interpreter may be shutting down; the worker exits on its own
+            # once its stdin pipe is closed
+            pass
+    
+    def close(self):
+        """Shut down the background flake8 worker, if running."""
+        worker = getattr(self, '_flake8_worker', None)
+        self._flake8_worker = None
+        if worker is not None and worker.poll() is None:
+            try:
+                worker.stdin.close()
+                worker.wait(timeout=5)
+            except Exception:
+                worker.kill()
+    
     def _ensure_output_dir(self):
         """Ensure output directory exists."""
         Path(self.output_dir).mkdir(parents=True, exist_ok=True)
     
     def generate_code(self, requirement: str, language: str = "python") -> Dict[str, Any]:
-        """Generate code from requirement description."""
+        """
+        Generate code from requirement description.
+        
+        Successful results are memoized per (requirement, language), so
+        repeated requests skip formatting, linting and saving as long as
+        the saved file is still on disk. Each call gets its own copy.
+        """
+        key = (requirement, language.lower())
+        with self._cache_lock:
+            cached = self._generate_cache.get(key)
+            if cached is not None:
+                self._generate_cache.move_to_end(key)
+        
+        if cached is not None and Path(cached["file_path"]).exists():
+            result = copy.deepcopy(cached)
+            result["language"] = language
+            return result
+        
+        result = self._generate_code(requirement, language)
+        if result["success"]:
+            with self._cache_lock:
+                self._generate_cache[key] = copy.deepcopy(result)
+                self._generate_cache.move_to_end(key)
+                if len(self._generate_cache) > GENERATE_CACHE_SIZE:
+                    self._generate_cache.popitem(last=False)
+        
+        return result
+    
+    def _generate_code(self, requirement: str, language: str) -> Dict[str, Any]:
+        """Run the full generate, format, validate and save pipeline."""
         try:
+            # Canonicalize once; private helpers expect a lower-case language
+            lang = language.lower()
+            
             # This would typically call the AI engine
             # For now, we'll create a template-based approach
-            code = self._create_code_template(requirement, language)
+            code = self._create_code_template(requirement, lang)
             
             # Format the code
-            formatted_code = self._format_code(code, language)
+            formatted_code = self._format_code(code, lang)
             
             # Validate the code
-            validation_result = self._validate_code(formatted_code, language)
+            validation_result = self._validate_code(formatted_code, lang)
             
             # Save the code
-            file_path = self._save_code(formatted_code, requirement, language)
+            file_path = self._save_code(formatted_code, requirement, lang)
             
             return {
                 "success": True,
@@ -54,7 +118,7 @@ class CodeGenerator:
     
     def _create_code_template(self, requirement: str, language: str) -> str:
         """Create code template based on requirement."""
-        if language.lower() == "python":
+        if language == "python":
             return self._create_python_template(requirement)
         else:
             return f"# {language} code for: {requirement}\n# TODO: Implement based on requirement"
@@ -162,11 +226,14 @@ if __name__ == "__main__":
     def _format_code(self, code: str, language: str) -> str:
         """Format code using appropriate formatter."""
         try:
-            if language.lower() == "python":
-                # Use black for Python formatting
+            if language == "python":
+                # Use black for Python formatting; fast mode skips the
+                # AST equivalence/stability re-check since we own the input
                 mode = black.FileMode()
-                formatted_code = black.format_str(code, mode=mode)
-                return formatted_code
+                try:
+                    return black.format_file_contents(code, fast=True, mode=mode)
+                except black.NothingChanged:
+                    return code
             else:
                 return code
         except Exception as e:
@@ -182,7 +249,7 @@ if __name__ == "__main__":
         }
         
         try:
-            if language.lower() == "python":
+            if language == "python":
                 # Check Python syntax
                 ast.parse(code)
                 validation_result["syntax_valid"] = True
@@ -206,19 +273,23 @@ if __name__ == "__main__":
             with open(temp_file, 'w') as f:
                 f.write(code)
             
-            # Run flake8
-            result = subprocess.run(
-                ['flake8', str(temp_file), '--max-line-length=88'],
-                capture_output=True,
-                text=True
-            )
+            try:
+                result = self._lint_with_worker(str(temp_file))
+            except Exception as e:
+                logging.warning(f"flake8 worker unavailable, running flake8 directly: {e}")
+                completed = subprocess.run(
+                    ['flake8', str(temp_file), *FLAKE8_ARGS],
+                    capture_output=True,
+                    text=True
+                )
+                result = {"stdout": completed.stdout, "stderr": completed.stderr}
             
             # Clean up
             temp_file.unlink()
             
             return {
-                "flake8_output": result.stdout,
-                "flake8_errors": result.stderr.split('\n') if result.stderr else []
+                "flake8_output": result["stdout"],
+                "flake8_errors": result["stderr"].split('\n') if result["stderr"] else []
             }
             
         except Exception as e:
@@ -227,6 +298,34 @@ if __name__ == "__main__":
                 "flake8_errors": [f"Flake8 error: {e}"]
             }
     
+    def _lint_with_worker(self, file_path: str) -> Dict[str, str]:
+        """Lint a file through the persistent flake8 worker, starting it on first use."""
+        with self._flake8_lock:
+            worker = self._flake8_worker
+            if worker is None or worker.poll() is not None:
+                worker = subprocess.Popen(
+                    [sys.executable, str(FLAKE8_WORKER), *FLAKE8_ARGS],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True
+                )
+                self._flake8_worker = worker
+            
+            try:
+                worker.stdin.write(f"{file_path}\n")
+                worker.stdin.flush()
+                reply = worker.stdout.readline()
+            except OSError:
+                reply = ""
+            
+            if not reply:
+                self._flake8_worker = None
+                worker.kill()
+                raise RuntimeError("flake8 worker exited")
+            
+            return json.loads(reply)
+    
     def _save_code(self, code: str, requirement: str, language: str) -> str:
         """Save generated code to file."""
         # Create filename from requirement
@@ -256,4 +355,4 @@ if __name__ == "__main__":
             "cpp": "cpp",
             "c": "c"
         }
-        return extensions.get(language.lower(), "txt") 
\ No newline at end of file
+        return extensions.get(language, "txt") 
\ No newline at end of file
@@ -10,6 +10,22 @@ from pathlib import Path
 import ast
 import re
 
+# Case-insensitive TODO marker, matched without lowering the whole source
+_TODO_RE = re.compile(r'todo', re.IGNORECASE)
+
+# Nodes that can carry a docstring
+_DOCSTRING_NODES = (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+
+# Display labels for the fixed set of assessment categories
+_CATEGORY_LABELS = {
+    category: category.replace('_', ' ').title()
+    for category in ("code_quality", "test_coverage", "security", "performance", "documentation")
+}
+
+def _score_status(score: float) -> str:
+    """Map a category score to its report status icon."""
+    return "✅" if score >= 70 else "⚠️" if score >= 50 else "❌"
+
 class DeployChecker:
     """Assesses code readiness for deployment."""
     
@@ -23,9 +39,17 @@ class DeployChecker:
         }
         self.minimum_score = 70  # Minimum score to be deployment ready
     
-    def assess_deployment_readiness(self, code: str, tests: str, language: str = "python") -> Dict[str, Any]:
-        """Comprehensive assessment of deployment readiness."""
+    def assess_deployment_readiness(self, code: str, tests: str, language: str = "python",
+                                    tree: Optional[ast.AST] = None) -> Dict[str, Any]:
+        """
+        Comprehensive assessment of deployment readiness.
+        
+        Callers that already parsed code can pass its tree to skip re-parsing.
+        """
         try:
+            # Canonicalize once; private assessors expect a lower-case language
+            language = language.lower()
+            
             assessment = {
                 "ready_for_deployment": False,
                 "overall_score": 0,
@@ -36,12 +60,18 @@ class DeployChecker:
                 "estimated_fix_time": "unknown"
             }
             
+            if tree is None and language == "python":
+                try:
+                    tree = ast.parse(code)
+                except SyntaxError:
+                    pass  # The assessors report it
+            
             # Perform individual assessments
-            code_quality_score = self._assess_code_quality(code, language)
+            code_quality_score = self._assess_code_quality(code, language, tree)
             test_coverage_score = self._assess_test_coverage(tests, language)
             security_score = self._assess_security(code, language)
             performance_score = self._assess_performance(code, language)
-            documentation_score = self._assess_documentation(code, language)
+            documentation_score = self._assess_documentation(code, language, tree)
             
             # Calculate weighted overall score
             assessment["detailed_scores"] = {
@@ -85,15 +115,16 @@ class DeployChecker:
                 "overall_score": 0
             }
     
-    def _assess_code_quality(self, code: str, language: str) -> float:
+    def _assess_code_quality(self, code: str, language: str, tree: Optional[ast.AST] = None) -> float:
         """Assess code quality (0-100)."""
         score = 100.0
         issues = []
         
         try:
-            if language.lower() == "python":
-                # Check syntax
-                ast.parse(code)
+            if language == "python":
+                # Check syntax, unless the caller already parsed it
+                if tree is None:
+                    ast.parse(code)
                 
                 # Check for common code quality issues
                 lines = code.split('\n')
@@ -105,7 +136,7 @@ class DeployChecker:
                     issues.append(f"{long_lines} lines exceed 88 characters")
                 
                 # Check for TODO comments
-                todo_count = code.lower().count('todo')
+                todo_count = len(_TODO_RE.findall(code))
                 if todo_count > 0:
                     score -= todo_count * 5
                     issues.append(f"{todo_count} TODO comments found")
@@ -145,7 +176,7 @@ class DeployChecker:
         issues = []
         
         try:
-            if language.lower() == "python":
+            if language == "python":
                 # Check for test framework imports
                 if "pytest" not in tests and "unittest" not in tests:
                     score -= 30
@@ -259,7 +290,7 @@ class DeployChecker:
         
         return max(0, score)
     
-    def _assess_documentation(self, code: str, language: str) -> float:
+    def _assess_documentation(self, code: str, language: str, tree: Optional[ast.AST] = None) -> float:
         """Assess documentation (0-100)."""
         score = 100.0
         issues = []
@@ -270,18 +301,34 @@ class DeployChecker:
             issues.append("No module docstring found")
         
         # Check for function/class docstrings
-        function_count = len(re.findall(r'def ', code))
-        class_count = len(re.findall(r'class ', code))
-        docstring_count = len(re.findall(r'"""', code)) + len(re.findall(r"'''", code))
-        
-        expected_docstrings = function_count + class_count + 1  # +1 for module docstring
+        try:
+            if tree is None:
+                tree = ast.parse(code)
+            documentable = [
+                node for node in ast.walk(tree)
+                if isinstance(node, _DOCSTRING_NODES)
+            ]
+            docstring_count = sum(1 for node in documentable if ast.get_docstring(node))
+            expected_docstrings = len(documentable)  # Module node included
+        except SyntaxError:
+            # Not parseable (or not Python); fall back to textual estimates
+            function_count = len(re.findall(r'def ', code))
+            class_count = len(re.findall(r'class ', code))
+            docstring_count = len(re.findall(r'"""', code)) + len(re.findall(r"'''", code))
+            expected_docstrings = function_count + class_count + 1  # +1 for module docstring
         if docstring_count < expected_docstrings:
             score -= 30
             issues.append(f"Insufficient docstrings: {docstring_count}/{expected_docstrings}")
         
         # Check for inline comments
-        comment_lines = len([line for line in code.split('\n') if line.strip().startswith('#')])
-        code_lines = len([line for line in code.split('\n') if line.strip() and not line.strip().startswith('#')])
+        comment_lines = 0
+        code_lines = 0
+        for line in code.split('\n'):
+            stripped = line.strip()
+            if stripped.startswith('#'):
+                comment_lines += 1
+            elif stripped:
+                code_lines += 1
         
         if code_lines > 0 and comment_lines / code_lines < 0.1:
             score -= 15
@@ -398,8 +445,8 @@ class DeployChecker:
 """
         
         for category, score in assessment['detailed_scores'].items():
-            status = "✅" if score >= 70 else "⚠️" if score >= 50 else "❌"
-            report += f"- **{category.replace('_', ' ').title()}**: {status} {score}/100\n"
+            label = _CATEGORY_LABELS.get(category) or category.replace('_', ' ').title()
+            report += f"- **{label}**: {_score_status(score)} {score}/100\n"
         
         if assessment['issues']:
             report += "\n## Issues Found\n"
@@ -3,17 +3,106 @@ Error Handler module for comprehensive error handling and validation.
 """
 
 import os
+import re
+import time
 import logging
-import traceback
-from typing import Dict, Any, List, Optional, Callable
+from collections import Counter, deque
+from itertools import islice
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Callable, Sequence, Tuple
 from datetime import datetime
-import json
+
+@lru_cache(maxsize=32)
+def _compile_patterns(patterns: Tuple[str, ...], ignore_case: bool) -> "re.Pattern":
+    """
+    Compile literal patterns into one alternation usable for a single sweep.
+    
+    Alternatives are tried longest first inside a lookahead, so overlapping
+    occurrences are all visited and any shorter pattern sharing a prefix
+    with the matched one can be recovered from the match text.
+    """
+    alternation = "|".join(re.escape(p) for p in sorted(set(patterns), key=len, reverse=True))
+    return re.compile(f"(?=({alternation}))", re.IGNORECASE if ignore_case else 0)
+
+def _find_patterns(patterns: Sequence[str], text: str, ignore_case: bool = False) -> List[str]:
+    """Return the patterns present in text, in rule order, from one regex pass."""
+    if not patterns:
+        return []
+    
+    regex = _compile_patterns(tuple(patterns), ignore_case)
+    if ignore_case:
+        hits = {m.group(1).lower() for m in regex.finditer(text)}
+        return [p for p in patterns if any(hit.startswith(p.lower()) for hit in hits)]
+    
+    hits = {m.group(1) for m in regex.finditer(text)}
+    return [p for p in patterns if any(hit.startswith(p) for hit in hits)]
+
+# Keywords inspected by the Python-specific validators, found in one sweep each
+_PYTHON_CODE_KEYWORDS = ("import", "from", "def ", "class ", "try:", "except", "logging", "print(")
+_PYTHON_TEST_KEYWORDS = ("pytest", "unittest", "def test_", "assert ")
+
+# Maximum number of stack frames kept per recorded traceback
+TRACEBACK_LIMIT = 20
+
+# Exception class name -> recovery strategy name, checked along the MRO
+_EXCEPTION_STRATEGIES = {
+    "ValidationError": "validation_error",
+    "ValueError": "validation_error",
+    "SyntaxError": "syntax_error",
+    "RuntimeError": "runtime_error",
+    "APIError": "ai_model_error",
+    "AIModelError": "ai_model_error",
+    "OSError": "file_error",
+}
+
+class ValidationResult:
+    """Outcome of a validate_* call; subscriptable like the dict it replaces."""
+    
+    # Written by hand rather than dataclass(slots=True), which needs Python 3.10
+    __slots__ = ("valid", "errors", "warnings", "suggestions")
+    
+    def __init__(self, valid: bool = True, errors: Optional[List[str]] = None,
+                 warnings: Optional[List[str]] = None, suggestions: Optional[List[str]] = None):
+        self.valid = valid
+        self.errors = errors if errors is not None else []
+        self.warnings = warnings if warnings is not None else []
+        self.suggestions = suggestions if suggestions is not None else []
+    
+    def __repr__(self) -> str:
+        return (f"ValidationResult(valid={self.valid!r}, errors={self.errors!r}, "
+                f"warnings={self.warnings!r}, suggestions={self.suggestions!r})")
+    
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, ValidationResult):
+            return NotImplemented
+        return self.asdict() == other.asdict()
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def asdict(self) -> Dict[str, Any]:
+        """Plain dict view for callers that serialize or mutate the result."""
+        return {
+            "valid": self.valid,
+            "errors": self.errors,
+            "warnings": self.warnings,
+            "suggestions": self.suggestions
+        }
 
 class ErrorHandler:
     """Handles errors, validation, and provides error recovery mechanisms."""
     
     def __init__(self):
-        self.error_log = []
+        # Keep only the most recent errors in memory; the optional stream
+        # file (ERROR_LOG_FILE) receives every error as one JSON line
+        self.error_log = deque(maxlen=int(os.getenv('ERROR_LOG_MAX', 1000)))
+        self._recovered_count = 0
+        self._type_counts: Counter = Counter()
+        self.error_log_file = os.getenv('ERROR_LOG_FILE')
+        self._error_log_fp = None
         self.validation_rules = {}
         self.recovery_strategies = {}
         self._setup_default_validation_rules()
@@ -52,206 +141,257 @@ class ErrorHandler:
             "file_error": self._handle_file_error
         }
     
-    def validate_requirement(self, requirement: str) -> Dict[str, Any]:
+    def validate_requirement(self, requirement: str) -> ValidationResult:
         """Validate requirement description."""
-        validation_result = {
-            "valid": True,
-            "errors": [],
-            "warnings": [],
-            "suggestions": []
-        }
+        validation_result = ValidationResult()
         
         rules = self.validation_rules.get("requirement", {})
         
         # Check length
         if len(requirement) < rules.get("min_length", 10):
-            validation_result["errors"].append(
+            validation_result.errors.append(
                 f"Requirement too short. Minimum {rules['min_length']} characters required."
             )
-            validation_result["valid"] = False
+            validation_result.valid = False
         
         if len(requirement) > rules.get("max_length", 1000):
-            validation_result["warnings"].append(
+            validation_result.warnings.append(
                 f"Requirement very long. Consider breaking it down."
             )
         
         # Check for forbidden patterns
-        for pattern in rules.get("forbidden_patterns", []):
-            if pattern.lower() in requirement.lower():
-                validation_result["errors"].append(
-                    f"Forbidden pattern detected: {pattern}"
-                )
-                validation_result["valid"] = False
+        for pattern in _find_patterns(rules.get("forbidden_patterns", []), requirement, ignore_case=True):
+            validation_result.errors.append(
+                f"Forbidden pattern detected: {pattern}"
+            )
+            validation_result.valid = False
         
         # Check for required content
-        if "function" not in requirement.lower() and "class" not in requirement.lower():
-            validation_result["suggestions"].append(
+        lowered = requirement.lower()
+        if "function" not in lowered and "class" not in lowered:
+            validation_result.suggestions.append(
                 "Consider specifying if you need a function or class implementation."
             )
         
         return validation_result
     
-    def validate_code(self, code: str, language: str = "python") -> Dict[str, Any]:
+    def validate_code(self, code: str, language: str = "python") -> ValidationResult:
         """Validate generated code."""
-        validation_result = {
-            "valid": True,
-            "errors": [],
-            "warnings": [],
-            "suggestions": []
-        }
+        validation_result = ValidationResult()
         
         rules = self.validation_rules.get("code", {})
         
-        # Check length
+        # Check length; code this short is rejected without scanning it
         if len(code) < rules.get("min_length", 5):
-            validation_result["errors"].append("Generated code too short.")
-            validation_result["valid"] = False
+            validation_result.errors.append("Generated code too short.")
+            validation_result.valid = False
+            return validation_result
         
         if len(code) > rules.get("max_length", 50000):
-            validation_result["warnings"].append("Generated code very long.")
+            validation_result.warnings.append("Generated code very long.")
+        
+        # Check for forbidden patterns; a security risk is fatal, so skip the rest
+        for pattern in _find_patterns(rules.get("forbidden_patterns", []), code):
+            validation_result.errors.append(
+                f"Security risk detected: {pattern}"
+            )
+            validation_result.valid = False
+        
+        if not validation_result.valid:
+            return validation_result
         
         # Check for required patterns
         required_patterns = rules.get("required_patterns", [])
+        found = set(_find_patterns(required_patterns, code))
         for pattern in required_patterns:
-            if pattern not in code:
-                validation_result["warnings"].append(
+            if pattern not in found:
+                validation_result.warnings.append(
                     f"Missing expected pattern: {pattern}"
                 )
         
-        # Check for forbidden patterns
-        for pattern in rules.get("forbidden_patterns", []):
-            if pattern in code:
-                validation_result["errors"].append(
-                    f"Security risk detected: {pattern}"
-                )
-                validation_result["valid"] = False
-        
         # Language-specific validation
         if language.lower() == "python":
             python_validation = self._validate_python_code(code)
-            validation_result["errors"].extend(python_validation["errors"])
-            validation_result["warnings"].extend(python_validation["warnings"])
-            validation_result["valid"] = validation_result["valid"] and python_validation["valid"]
+            validation_result.errors.extend(python_validation.errors)
+            validation_result.warnings.extend(python_validation.warnings)
+            validation_result.suggestions.extend(python_validation.suggestions)
+            validation_result.valid = validation_result.valid and python_validation.valid
         
         return validation_result
     
-    def _validate_python_code(self, code: str) -> Dict[str, Any]:
+    def _validate_python_code(self, code: str) -> ValidationResult:
         """Validate Python-specific code patterns."""
-        validation_result = {
-            "valid": True,
-            "errors": [],
-            "warnings": []
-        }
+        validation_result = ValidationResult()
+        
+        found = set(_find_patterns(_PYTHON_CODE_KEYWORDS, code))
         
         # Check for basic Python structure
-        if "import" not in code and "from" not in code:
-            validation_result["warnings"].append("No imports found in code.")
+        if "import" not in found and "from" not in found:
+            validation_result.warnings.append("No imports found in code.")
         
-        if "def " not in code and "class " not in code:
-            validation_result["warnings"].append("No functions or classes found in code.")
+        if "def " not in found and "class " not in found:
+            validation_result.warnings.append("No functions or classes found in code.")
         
         # Check for proper error handling
-        if "try:" in code and "except" not in code:
-            validation_result["errors"].append("Incomplete try-except block.")
-            validation_result["valid"] = False
+        if "try:" in found and "except" not in found:
+            validation_result.errors.append("Incomplete try-except block.")
+            validation_result.valid = False
         
         # Check for logging
-        if "logging" not in code and "print(" in code:
-            validation_result["suggestions"].append("Consider using logging instead of print statements.")
+        if "logging" not in found and "print(" in found:
+            validation_result.suggestions.append("Consider using logging instead of print statements.")
         
         return validation_result
     
-    def validate_tests(self, test_code: str, language: str = "python") -> Dict[str, Any]:
+    def validate_tests(self, test_code: str, language: str = "python") -> ValidationResult:
         """Validate generated test code."""
-        validation_result = {
-            "valid": True,
-            "errors": [],
-            "warnings": [],
-            "suggestions": []
-        }
+        validation_result = ValidationResult()
         
         rules = self.validation_rules.get("test", {})
         
-        # Check length
+        # Check length; tests this short are rejected without scanning them
         if len(test_code) < rules.get("min_length", 10):
-            validation_result["errors"].append("Generated tests too short.")
-            validation_result["valid"] = False
+            validation_result.errors.append("Generated tests too short.")
+            validation_result.valid = False
+            return validation_result
         
         # Check for required patterns
         required_patterns = rules.get("required_patterns", [])
+        found = set(_find_patterns(required_patterns, test_code))
         for pattern in required_patterns:
-            if pattern not in test_code:
-                validation_result["warnings"].append(
+            if pattern not in found:
+                validation_result.warnings.append(
                     f"Missing expected test pattern: {pattern}"
                 )
         
         # Check for forbidden patterns
-        for pattern in rules.get("forbidden_patterns", []):
-            if pattern in test_code:
-                validation_result["warnings"].append(
-                    f"Test contains interactive elements: {pattern}"
-                )
+        for pattern in _find_patterns(rules.get("forbidden_patterns", []), test_code):
+            validation_result.warnings.append(
+                f"Test contains interactive elements: {pattern}"
+            )
         
         # Language-specific test validation
         if language.lower() == "python":
             python_test_validation = self._validate_python_tests(test_code)
-            validation_result["errors"].extend(python_test_validation["errors"])
-            validation_result["warnings"].extend(python_test_validation["warnings"])
-            validation_result["valid"] = validation_result["valid"] and python_test_validation["valid"]
+            validation_result.errors.extend(python_test_validation.errors)
+            validation_result.warnings.extend(python_test_validation.warnings)
+            validation_result.valid = validation_result.valid and python_test_validation.valid
         
         return validation_result
     
-    def _validate_python_tests(self, test_code: str) -> Dict[str, Any]:
+    def _validate_python_tests(self, test_code: str) -> ValidationResult:
         """Validate Python-specific test patterns."""
-        validation_result = {
-            "valid": True,
-            "errors": [],
-            "warnings": []
-        }
+        validation_result = ValidationResult()
+        
+        found = set(_find_patterns(_PYTHON_TEST_KEYWORDS, test_code))
         
         # Check for pytest imports
-        if "pytest" not in test_code and "unittest" not in test_code:
-            validation_result["warnings"].append("No testing framework imports found.")
+        if "pytest" not in found and "unittest" not in found:
+            validation_result.warnings.append("No testing framework imports found.")
         
         # Check for test functions
-        if "def test_" not in test_code:
-            validation_result["warnings"].append("No test functions found.")
+        if "def test_" not in found:
+            validation_result.warnings.append("No test functions found.")
         
         # Check for assertions
-        if "assert " not in test_code:
-            validation_result["warnings"].append("No assertions found in tests.")
+        if "assert " not in found:
+            validation_result.warnings.append("No assertions found in tests.")
         
         return validation_result
     
     def handle_error(self, error: Exception, context: str = "") -> Dict[str, Any]:
         """Handle errors and attempt recovery."""
         error_info = {
-            "timestamp": datetime.now().isoformat(),
+            "ts_ns": time.time_ns(),
             "error_type": type(error).__name__,
             "error_message": str(error),
             "context": context,
-            "traceback": traceback.format_exc(),
+            "traceback": self._format_traceback(error),
             "recovered": False,
             "recovery_action": None
         }
         
-        # Log the error
+        # Log the error; keep the running counts in step with evictions
+        if self.error_log and len(self.error_log) == self.error_log.maxlen:
+            self._forget(self.error_log[0])
         self.error_log.append(error_info)
+        self._type_counts[error_info["error_type"]] += 1
         logging.error(f"Error in {context}: {error}")
         
         # Attempt recovery
+        strategy_func = self._find_recovery_strategy(error)
+        if strategy_func is not None:
+            try:
+                recovery_result = strategy_func(error, context)
+                error_info["recovered"] = recovery_result.get("success", False)
+                error_info["recovery_action"] = recovery_result.get("action", None)
+                self._recovered_count += bool(error_info["recovered"])
+            except Exception as recovery_error:
+                logging.error(f"Recovery failed: {recovery_error}")
+        
+        self._stream_error(error_info)
+        return error_info
+    
+    def _forget(self, error_info: Dict[str, Any]):
+        """Drop an entry about to be evicted from the running counts."""
+        if error_info["recovered"]:
+            self._recovered_count -= 1
+        error_type = error_info["error_type"]
+        self._type_counts[error_type] -= 1
+        if not self._type_counts[error_type]:
+            del self._type_counts[error_type]
+    
+    def _format_traceback(self, error: Exception) -> str:
+        """Format the error's own traceback, capped at TRACEBACK_LIMIT frames."""
+        if error.__traceback__ is None:
+            # Never raised, so there is no stack worth formatting
+            return ""
+        
+        import traceback
+        return "".join(
+            traceback.TracebackException.from_exception(error, limit=TRACEBACK_LIMIT).format()
+        )
+    
+    def _find_recovery_strategy(self, error: Exception) -> Optional[Callable]:
+        """Pick the recovery strategy for an error, most specific exception class first."""
+        for cls in type(error).__mro__:
+            strategy_name = _EXCEPTION_STRATEGIES.get(cls.__name__)
+            if strategy_name in self.recovery_strategies:
+                return self.recovery_strategies[strategy_name]
+        
+        # Fall back to fuzzy name matching for custom strategies
         error_type = type(error).__name__.lower()
         for strategy_name, strategy_func in self.recovery_strategies.items():
             if strategy_name in error_type or error_type in strategy_name:
-                try:
-                    recovery_result = strategy_func(error, context)
-                    error_info["recovered"] = recovery_result.get("success", False)
-                    error_info["recovery_action"] = recovery_result.get("action", None)
-                    break
-                except Exception as recovery_error:
-                    logging.error(f"Recovery failed: {recovery_error}")
+                return strategy_func
         
-        return error_info
+        return None
+    
+    def _stream_error(self, error_info: Dict[str, Any]):
+        """Append an error record to the NDJSON stream file, if configured."""
+        if not self.error_log_file:
+            return
+        
+        import json
+        
+        try:
+            if self._error_log_fp is None:
+                self._error_log_fp = open(self.error_log_file, 'a', encoding='utf-8', buffering=1)
+            self._error_log_fp.write(json.dumps(self._with_timestamp(error_info), default=str) + "\n")
+        except OSError as e:
+            logging.warning(f"Could not write error log stream: {e}")
+    
+    def _with_timestamp(self, error_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of an error record with its ISO 'timestamp' filled in."""
+        if "ts_ns" not in error_info:
+            return error_info
+        return dict(error_info, timestamp=datetime.fromtimestamp(error_info["ts_ns"] / 1e9).isoformat())
+    
+    def close(self):
+        """Close the error log stream file, if open."""
+        if self._error_log_fp is not None:
+            self._error_log_fp.close()
+            self._error_log_fp = None
     
     def _handle_validation_error(self, error: Exception, context: str) -> Dict[str, Any]:
         """Handle validation errors."""
@@ -299,32 +439,34 @@ class ErrorHandler:
             return {"total_errors": 0, "recovery_rate": 100.0}
         
         total_errors = len(self.error_log)
-        recovered_errors = sum(1 for error in self.error_log if error.get("recovered", False))
+        recovered_errors = self._recovered_count
         recovery_rate = (recovered_errors / total_errors) * 100
         
-        error_types = {}
-        for error in self.error_log:
-            error_type = error.get("error_type", "Unknown")
-            error_types[error_type] = error_types.get(error_type, 0) + 1
+        error_types = dict(self._type_counts)
         
         return {
             "total_errors": total_errors,
             "recovered_errors": recovered_errors,
             "recovery_rate": round(recovery_rate, 2),
             "error_types": error_types,
-            "recent_errors": self.error_log[-5:]  # Last 5 errors
+            # Last 5 errors, read from the tail without copying the whole log
+            "recent_errors": [self._with_timestamp(e) for e in reversed(list(islice(reversed(self.error_log), 5)))]
         }
     
     def clear_error_log(self):
         """Clear the error log."""
         self.error_log.clear()
+        self._recovered_count = 0
+        self._type_counts.clear()
     
     def export_error_log(self, file_path: str = None) -> str:
         """Export error log to file."""
         if not file_path:
             file_path = f"error_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         
+        import json
+        
         with open(file_path, 'w') as f:
-            json.dump(self.error_log, f, indent=2)
+            json.dump([self._with_timestamp(e) for e in self.error_log], f, indent=2)
         
         return file_path 
\ No newline at end of file
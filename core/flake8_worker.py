@@ -0,0 +1,50 @@
+"""
+Long-lived flake8 worker used by the code generator.
+
+Reads one file path per line on stdin, lints it in-process and answers with
+one JSON line on stdout, so interpreter start-up and flake8 imports are paid
+once per worker instead of once per validation.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import traceback
+from typing import Dict, List
+
+from flake8.main import cli
+
+
+def _lint(path: str, args: List[str]) -> Dict[str, str]:
+    """Run flake8 on a single file and collect its report."""
+    fd, report_path = tempfile.mkstemp(suffix=".flake8")
+    os.close(fd)
+    try:
+        cli.main([path, *args, f"--output-file={report_path}"])
+        with open(report_path, 'r') as f:
+            return {"stdout": f.read(), "stderr": ""}
+    except (Exception, SystemExit):
+        return {"stdout": "", "stderr": traceback.format_exc()}
+    finally:
+        os.unlink(report_path)
+
+
+def main():
+    """Serve lint requests until stdin is closed."""
+    args = sys.argv[1:]
+
+    # Keep replies on the original stdout; anything flake8 prints goes to stderr
+    replies = os.fdopen(os.dup(sys.stdout.fileno()), 'w')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    for line in sys.stdin:
+        path = line.rstrip('\n')
+        if not path:
+            continue
+        replies.write(json.dumps(_lint(path, args)) + '\n')
+        replies.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,148 +3,102 @@ Test Generator module for creating comprehensive test cases.
 """
 
 import os
+import sys
 import logging
-import subprocess
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 import ast
 
-class TestGenerator:
-    """Handles test case generation and validation."""
+@lru_cache(maxsize=128)
+def _parse_cached(code: str) -> ast.AST:
+    """Parse Python source, reusing the tree for recently seen code."""
+    return ast.parse(code)
+
+class _StructureVisitor(ast.NodeVisitor):
+    """Collects classes, module-level functions and imports in one traversal."""
     
     def __init__(self):
-        self.output_dir = os.getenv('GENERATED_TESTS_DIR', 'generated/tests')
-        self._ensure_output_dir()
+        self.classes: List[Dict[str, Any]] = []
+        self.functions: List[Dict[str, Any]] = []
+        self.imports: List[str] = []
+        self._depth = 0  # Nesting inside classes/functions
     
-    def _ensure_output_dir(self):
-        """Ensure output directory exists."""
-        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+    def visit(self, node: ast.AST):
+        # Classes, functions and imports are statements, so expression subtrees can be skipped
+        if not isinstance(node, ast.expr):
+            super().visit(node)
     
-    def generate_tests(self, code: str, language: str = "python") -> Dict[str, Any]:
-        """Generate test cases for the given code."""
-        try:
-            # Analyze the code to understand what to test
-            code_analysis = self._analyze_code(code, language)
-            
-            # Generate test cases
-            test_code = self._create_test_template(code, code_analysis, language)
-            
-            # Validate test code
-            validation_result = self._validate_tests(test_code, language)
-            
-            # Save test file
-            test_file_path = self._save_tests(test_code, code_analysis, language)
-            
-            # Run tests to check coverage
-            test_results = self._run_tests(test_file_path, language)
-            
-            return {
-                "success": True,
-                "test_code": test_code,
-                "test_file_path": test_file_path,
-                "code_analysis": code_analysis,
-                "validation": validation_result,
-                "test_results": test_results,
-                "language": language
-            }
-            
-        except Exception as e:
-            logging.error(f"Error generating tests: {e}")
-            return {
-                "success": False,
-                "error": str(e)
-            }
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self.classes.append({
+            "name": node.name,
+            "methods": [n.name for n in node.body if isinstance(n, ast.FunctionDef)],
+            "line_count": len(node.body)
+        })
+        self._visit_nested(node)
     
-    def _analyze_code(self, code: str, language: str) -> Dict[str, Any]:
-        """Analyze code to understand structure and generate appropriate tests."""
-        analysis = {
-            "classes": [],
-            "functions": [],
-            "imports": [],
-            "complexity": "low"
-        }
-        
-        try:
-            if language.lower() == "python":
-                tree = ast.parse(code)
-                
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.ClassDef):
-                        analysis["classes"].append({
-                            "name": node.name,
-                            "methods": [n.name for n in node.body if isinstance(n, ast.FunctionDef)],
-                            "line_count": len(node.body)
-                        })
-                    elif isinstance(node, ast.FunctionDef):
-                        analysis["functions"].append({
-                            "name": node.name,
-                            "args": [arg.arg for arg in node.args.args],
-                            "line_count": len(node.body) if node.body else 0
-                        })
-                    elif isinstance(node, ast.Import):
-                        analysis["imports"].extend([alias.name for alias in node.names])
-                    elif isinstance(node, ast.ImportFrom):
-                        analysis["imports"].append(f"{node.module}.{', '.join([alias.name for alias in node.names])}")
-                
-                # Determine complexity
-                total_lines = len(code.split('\n'))
-                if total_lines > 100:
-                    analysis["complexity"] = "high"
-                elif total_lines > 50:
-                    analysis["complexity"] = "medium"
-                    
-        except Exception as e:
-            logging.warning(f"Code analysis failed: {e}")
-        
-        return analysis
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        # Methods and nested helpers are not standalone functions to test
+        if self._depth == 0:
+            self.functions.append({
+                "name": node.name,
+                "args": [arg.arg for arg in node.args.args],
+                "line_count": len(node.body) if node.body else 0
+            })
+        self._visit_nested(node)
     
-    def _create_test_template(self, code: str, analysis: Dict[str, Any], language: str) -> str:
-        """Create test template based on code analysis."""
-        if language.lower() == "python":
-            return self._create_pytest_template(code, analysis)
-        else:
-            return f"# {language} tests for the generated code\n# TODO: Implement test cases"
+    def visit_Import(self, node: ast.Import):
+        self.imports.extend(alias.name for alias in node.names)
     
-    def _create_pytest_template(self, code: str, analysis: Dict[str, Any]) -> str:
-        """Create pytest template."""
-        imports = analysis.get("imports", [])
-        classes = analysis.get("classes", [])
-        functions = analysis.get("functions", [])
-        
-        # Add necessary imports for testing
-        test_imports = [
-            "import pytest",
-            "from unittest.mock import Mock, patch, MagicMock",
-            "import sys",
-            "import os"
-        ]
-        
-        # Add imports from the original code
-        for imp in imports:
-            if "logging" in imp:
-                test_imports.append("import logging")
-            if "pathlib" in imp:
-                test_imports.append("from pathlib import Path")
-        
-        test_imports = list(set(test_imports))  # Remove duplicates
-        
-        # Generate test classes
-        test_classes = []
-        for cls in classes:
-            class_tests = self._generate_class_tests(cls)
-            test_classes.append(class_tests)
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        self.imports.append(f"{node.module}.{', '.join(alias.name for alias in node.names)}")
+    
+    def _visit_nested(self, node: ast.AST):
+        self._depth += 1
+        self.generic_visit(node)
+        self._depth -= 1
+
+def _analyze_python_code(code: str) -> Dict[str, Any]:
+    """
+    Analyze Python code structure for test generation.
+    
+    Module-level so it can be shipped to worker processes by
+    TestGenerator.generate_tests_batch.
+    """
+    analysis = {
+        "classes": [],
+        "functions": [],
+        "imports": [],
+        "complexity": "low"
+    }
+    
+    try:
+        tree = _parse_cached(code)
         
-        # Generate function tests
-        function_tests = []
-        for func in functions:
-            if not any(func["name"] in cls["methods"] for cls in classes):
-                function_tests.append(self._generate_function_tests(func))
+        visitor = _StructureVisitor()
+        visitor.visit(tree)
+        analysis["classes"] = visitor.classes
+        analysis["functions"] = visitor.functions
+        analysis["imports"] = visitor.imports
         
-        return f'''"""
+        # Determine complexity
+        total_lines = code.count('\n') + 1
+        if total_lines > 100:
+            analysis["complexity"] = "high"
+        elif total_lines > 50:
+            analysis["complexity"] = "medium"
+            
+    except Exception as e:
+        logging.warning(f"Code analysis failed: {e}")
+    
+    return analysis
+
+# Skeleton for generated pytest files; filled with str.format
+_PYTEST_TEMPLATE = '''"""
 Generated test cases for the implementation.
 """
 
-{chr(10).join(test_imports)}
+{imports}
 
 # Import the module to test
 # Note: You may need to adjust the import path based on your project structure
@@ -213,7 +167,7 @@ class TestRequirementImplementation:
         # assert "timestamp" in status
         pass
 
-{chr(10).join(function_tests)}
+{function_tests}
 
 # Integration tests
 class TestIntegration:
@@ -269,6 +223,184 @@ def mock_config():
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 '''
+
+# Below this many inputs a process pool costs more than it saves
+BATCH_POOL_THRESHOLD = 4
+
+# Seconds allowed for a single generated test file to run
+TEST_TIMEOUT = 30
+
+class TestGenerator:
+    """Handles test case generation and validation."""
+    
+    # File extension per canonical (lower-case) language name
+    _EXTENSIONS = {
+        "python": "py",
+        "javascript": "js",
+        "typescript": "ts",
+        "java": "java",
+        "cpp": "cpp",
+        "c": "c"
+    }
+    
+    def __init__(self):
+        self.output_dir = os.getenv('GENERATED_TESTS_DIR', 'generated/tests')
+        self._ensure_output_dir()
+    
+    def _ensure_output_dir(self):
+        """Ensure output directory exists."""
+        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+    
+    def generate_tests(self, code: str, language: str = "python") -> Dict[str, Any]:
+        """Generate test cases for the given code."""
+        return self._generate_tests(code, language)
+    
+    def generate_tests_batch(self, codes: List[str], language: str = "python") -> List[Dict[str, Any]]:
+        """
+        Generate test cases for many sources at once.
+        
+        Python sources are analyzed in parallel worker processes when the batch
+        is large enough and the saved test files are run concurrently;
+        templating and saving stay sequential.
+        """
+        lang = language.lower()
+        analyses = None
+        if lang == "python" and len(codes) >= BATCH_POOL_THRESHOLD:
+            workers = os.cpu_count() or 1
+            chunksize = max(1, len(codes) // (4 * workers))
+            try:
+                from concurrent.futures import ProcessPoolExecutor
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    analyses = list(executor.map(_analyze_python_code, codes, chunksize=chunksize))
+            except Exception as e:
+                logging.warning(f"Parallel code analysis failed, analyzing sequentially: {e}")
+        
+        if analyses is None:
+            analyses = [self._analyze_code(code, lang) for code in codes]
+        
+        # Sources that share a main class would share a test file; number the
+        # repeats so every item's tests are saved and run on their own
+        filenames = []
+        seen: Dict[str, int] = {}
+        for analysis in analyses:
+            filename = self._test_filename(analysis)
+            count = seen.get(filename, 0)
+            seen[filename] = count + 1
+            filenames.append(f"{filename}_{count}" if count else filename)
+        
+        results = [
+            self._generate_tests(code, language, analysis, run_tests=False, filename=filename)
+            for code, analysis, filename in zip(codes, analyses, filenames)
+        ]
+        
+        generated = [result for result in results if result["success"]]
+        test_results = self.run_tests_batch([result["test_file_path"] for result in generated], lang)
+        for result, test_result in zip(generated, test_results):
+            result["test_results"] = test_result
+        
+        return results
+    
+    def _generate_tests(self, code: str, language: str,
+                        code_analysis: Optional[Dict[str, Any]] = None,
+                        run_tests: bool = True,
+                        filename: Optional[str] = None) -> Dict[str, Any]:
+        """Generate, validate, save and run tests, reusing a precomputed analysis if given."""
+        try:
+            # Canonicalize once; private helpers expect a lower-case language
+            lang = language.lower()
+            
+            # Analyze the code to understand what to test
+            if code_analysis is None:
+                code_analysis = self._analyze_code(code, lang)
+            
+            # Generate test cases
+            test_code = self._create_test_template(code, code_analysis, lang)
+            
+            # Validate test code
+            validation_result = self._validate_tests(test_code, lang)
+            
+            # Save test file
+            test_file_path = self._save_tests(test_code, code_analysis, lang, filename)
+            
+            # Run tests to check coverage
+            test_results = self._run_tests(test_file_path, lang) if run_tests else {}
+            
+            return {
+                "success": True,
+                "test_code": test_code,
+                "test_file_path": test_file_path,
+                "code_analysis": code_analysis,
+                "validation": validation_result,
+                "test_results": test_results,
+                "language": language
+            }
+            
+        except Exception as e:
+            logging.error(f"Error generating tests: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def _analyze_code(self, code: str, language: str) -> Dict[str, Any]:
+        """Analyze code to understand structure and generate appropriate tests."""
+        if language == "python":
+            return _analyze_python_code(code)
+        
+        return {
+            "classes": [],
+            "functions": [],
+            "imports": [],
+            "complexity": "low"
+        }
+    
+    def _create_test_template(self, code: str, analysis: Dict[str, Any], language: str) -> str:
+        """Create test template based on code analysis."""
+        if language == "python":
+            return self._create_pytest_template(code, analysis)
+        else:
+            return f"# {language} tests for the generated code\n# TODO: Implement test cases"
+    
+    def _create_pytest_template(self, code: str, analysis: Dict[str, Any]) -> str:
+        """Create pytest template."""
+        imports = analysis.get("imports", [])
+        classes = analysis.get("classes", [])
+        functions = analysis.get("functions", [])
+        
+        # Add necessary imports for testing
+        test_imports = [
+            "import pytest",
+            "from unittest.mock import Mock, patch, MagicMock",
+            "import sys",
+            "import os"
+        ]
+        
+        # Add imports from the original code
+        for imp in imports:
+            if "logging" in imp:
+                test_imports.append("import logging")
+            if "pathlib" in imp:
+                test_imports.append("from pathlib import Path")
+        
+        test_imports = list(dict.fromkeys(test_imports))  # Remove duplicates, keep order
+        
+        # Generate test classes
+        test_classes = []
+        for cls in classes:
+            class_tests = self._generate_class_tests(cls)
+            test_classes.append(class_tests)
+        
+        # Generate function tests
+        method_names = {method for cls in classes for method in cls["methods"]}
+        function_tests = []
+        for func in functions:
+            if func["name"] not in method_names:
+                function_tests.append(self._generate_function_tests(func))
+        
+        return _PYTEST_TEMPLATE.format(
+            imports="\n".join(test_imports),
+            function_tests="\n".join(function_tests)
+        )
     
     def _generate_class_tests(self, class_info: Dict[str, Any]) -> str:
         """Generate test methods for a class."""
@@ -284,6 +416,7 @@ if __name__ == "__main__":
         pass
 ''')
         
+        methods_block = "\n".join(test_methods)
         return f'''
 class Test{class_name}:
     """Test cases for {class_name} class."""
@@ -293,7 +426,7 @@ class Test{class_name}:
         # TODO: Initialize {class_name} instance
         pass
     
-{chr(10).join(test_methods)}
+{methods_block}
 '''
     
     def _generate_function_tests(self, func_info: Dict[str, Any]) -> str:
@@ -323,9 +456,9 @@ def test_{func_name}_with_invalid_input():
         }
         
         try:
-            if language.lower() == "python":
+            if language == "python":
                 # Check Python syntax
-                ast.parse(test_code)
+                _parse_cached(test_code)
                 validation_result["syntax_valid"] = True
                 
         except SyntaxError as e:
@@ -335,32 +468,47 @@ def test_{func_name}_with_invalid_input():
         
         return validation_result
     
-    def _save_tests(self, test_code: str, analysis: Dict[str, Any], language: str) -> str:
-        """Save generated tests to file."""
-        # Create filename based on analysis
+    def _test_filename(self, analysis: Dict[str, Any]) -> str:
+        """Test file name (without extension) for an analysis, based on its first class."""
         if analysis.get("classes"):
             main_class = analysis["classes"][0]["name"]
-            filename = f"test_{main_class.lower()}"
-        else:
-            filename = "test_generated_code"
+            return f"test_{main_class.lower()}"
+        return "test_generated_code"
+    
+    def _save_tests(self, test_code: str, analysis: Dict[str, Any], language: str,
+                    filename: Optional[str] = None) -> str:
+        """Save generated tests to file."""
+        # Create filename based on analysis
+        if filename is None:
+            filename = self._test_filename(analysis)
         
         file_path = Path(self.output_dir) / f"{filename}.{self._get_file_extension(language)}"
+        content = test_code.encode('utf-8')
+        
+        # Leave an identical existing file untouched (no write, no mtime change)
+        try:
+            if file_path.stat().st_size == len(content) and file_path.read_bytes() == content:
+                return str(file_path)
+        except FileNotFoundError:
+            pass
         
-        with open(file_path, 'w') as f:
-            f.write(test_code)
+        with open(file_path, 'wb') as f:
+            f.write(content)
         
         return str(file_path)
     
     def _run_tests(self, test_file_path: str, language: str) -> Dict[str, Any]:
         """Run tests to check if they work."""
+        import subprocess
+        
         try:
-            if language.lower() == "python":
+            if language == "python":
                 # Run pytest
                 result = subprocess.run(
-                    ['python', '-m', 'pytest', test_file_path, '--tb=short'],
+                    [sys.executable, '-m', 'pytest', test_file_path, '--tb=short'],
                     capture_output=True,
                     text=True,
-                    timeout=30
+                    timeout=TEST_TIMEOUT
                 )
                 
                 return {
@@ -377,14 +525,61 @@ def test_{func_name}_with_invalid_input():
         except Exception as e:
             return {"error": f"Test execution failed: {e}"}
     
+    def run_tests_batch(self, test_file_paths: List[str], language: str = "python") -> List[Dict[str, Any]]:
+        """Run several test files concurrently, at most one pytest process per CPU."""
+        language = language.lower()
+        if language != "python" or not test_file_paths:
+            return [self._run_tests(path, language) for path in test_file_paths]
+        
+        import asyncio
+        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._run_pytest_batch(test_file_paths))
+        
+        # Already inside an event loop (asyncio.run would fail); run sequentially
+        return [self._run_tests(path, language) for path in test_file_paths]
+    
+    async def _run_pytest_batch(self, test_file_paths: List[str]) -> List[Dict[str, Any]]:
+        """Run pytest on each path in its own subprocess, bounded by a semaphore."""
+        import asyncio
+        
+        semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+        
+        async def run_one(test_file_path: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._run_pytest_async(test_file_path)
+        
+        return list(await asyncio.gather(*(run_one(path) for path in test_file_paths)))
+    
+    async def _run_pytest_async(self, test_file_path: str) -> Dict[str, Any]:
+        """Async counterpart of _run_tests for Python test files."""
+        import asyncio
+        
+        try:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, '-m', 'pytest', test_file_path, '--tb=short',
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=TEST_TIMEOUT)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                return {"error": "Test execution timed out"}
+            
+            return {
+                "exit_code": process.returncode,
+                "stdout": stdout.decode(errors='replace'),
+                "stderr": stderr.decode(errors='replace'),
+                "tests_passed": process.returncode == 0
+            }
+            
+        except Exception as e:
+            return {"error": f"Test execution failed: {e}"}
+    
     def _get_file_extension(self, language: str) -> str:
         """Get file extension for test files."""
-        extensions = {
-            "python": "py",
-            "javascript": "js",
-            "typescript": "ts",
-            "java": "java",
-            "cpp": "cpp",
-            "c": "c"
-        }
-        return extensions.get(language.lower(), "txt") 
\ No newline at end of file
+        return self._EXTENSIONS.get(language, "txt")
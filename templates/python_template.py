@@ -6,6 +6,7 @@ Language: {{ language }}
 """
 
 import logging
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 import os
 from pathlib import Path
@@ -22,6 +23,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1)
+def _default_config() -> Dict[str, Any]:
+    """Read default configuration from the environment once per process."""
+    return {
+        "debug": os.getenv("DEBUG", "False").lower() == "true",
+        "log_level": os.getenv("LOG_LEVEL", "INFO"),
+        "timeout": int(os.getenv("TIMEOUT", "30"))
+    }
+
 class {{ class_name }}:
     """
     Implementation for: {{ requirement }}
@@ -39,11 +49,8 @@ class {{ class_name }}:
     
     def _load_default_config(self) -> Dict[str, Any]:
         """Load default configuration."""
-        return {
-            "debug": os.getenv("DEBUG", "False").lower() == "true",
-            "log_level": os.getenv("LOG_LEVEL", "INFO"),
-            "timeout": int(os.getenv("TIMEOUT", "30"))
-        }
+        # Copy so per-instance changes don't leak into the shared defaults
+        return dict(_default_config())
     
     def process_requirement(self, input_data: Any) -> Dict[str, Any]:
         """
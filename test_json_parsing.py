@@ -4,7 +4,26 @@ Test script for JSON parsing functionality
 """
 
 import json
-import re
+from typing import Any, Optional
+
+_JSON_DECODER = json.JSONDecoder()
+
+def _strip_markdown_fences(response: str) -> str:
+    """Remove a leading ```json fence and a trailing ``` fence, if present."""
+    # The fences are fixed strings, so prefix/suffix checks are enough
+    if response[:7].lower() == '```json':
+        response = response[7:].lstrip()
+    if response.endswith('```'):
+        response = response[:-3].rstrip()
+    return response
+
+def _decode_json_array(text: str) -> Optional[Any]:
+    """Decode the JSON value starting at the first '[' in text, or return None if there is none."""
+    start_idx = text.find('[')
+    if start_idx == -1:
+        return None
+    # raw_decode stops at the matching ']' in one pass, ignoring any text after it
+    return _JSON_DECODER.raw_decode(text, start_idx)[0]
 
 def test_json_parsing():
     """Test JSON parsing with different response formats"""
@@ -44,18 +63,14 @@ def test_json_parsing():
             # Clean the response - remove any markdown formatting
             cleaned_response = test_case['response'].strip()
             
-            # Remove markdown code blocks if present
-            cleaned_response = re.sub(r'```json\s*', '', cleaned_response)
-            cleaned_response = re.sub(r'```\s*$', '', cleaned_response)
+            # Remove markdown code blocks if present; a bare array has none
+            if not cleaned_response.startswith('['):
+                cleaned_response = _strip_markdown_fences(cleaned_response)
             
             # Find JSON array
-            start_idx = cleaned_response.find('[')
-            end_idx = cleaned_response.rfind(']') + 1
+            result = _decode_json_array(cleaned_response)
             
-            if start_idx != -1 and end_idx != 0:
-                json_str = cleaned_response[start_idx:end_idx]
-                result = json.loads(json_str)
-                
+            if result is not None:
                 # Validate the structure
                 if isinstance(result, list) and len(result) > 0:
                     print("✅ Successfully parsed JSON array")
@@ -4,7 +4,11 @@ Test script for tech stack suggestion functionality
 """
 
 import sys
+import json
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Optional, Tuple
 
 # Add project root to path
 project_root = Path(__file__).parent
@@ -12,35 +16,22 @@ sys.path.insert(0, str(project_root))
 
 from core import AIEngine
 
-def test_tech_stack_suggestion():
-    """Test the tech stack suggestion functionality"""
-    
-    print("🧪 Testing Tech Stack Suggestion")
-    print("=" * 50)
-    
-    # Initialize AI engine
-    ai_engine = AIEngine()
-    
-    # Test requirement
-    requirement = """
-    Create a web application for managing a library system with the following features:
-    - User authentication and authorization
-    - Book catalog management (add, edit, delete, search)
-    - Borrowing and returning books
-    - Fine calculation for overdue books
-    - Admin dashboard with analytics
-    - RESTful API for mobile app integration
-    - Real-time notifications
-    - Report generation (PDF/Excel)
-    """
-    
-    print("📋 Test Requirement:")
-    print(requirement)
-    
-    # Test tech stack suggestion
-    print("\n🔍 Testing tech stack suggestion...")
-    
-    prompt = f"""
+_JSON_DECODER = json.JSONDecoder()
+
+TECH_STACK_CACHE_SIZE = 128
+_tech_stack_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+def _decode_json_array(text: str) -> Optional[Any]:
+    """Decode the JSON value starting at the first '[' in text, or return None if there is none."""
+    start_idx = text.find('[')
+    if start_idx == -1:
+        return None
+    # raw_decode stops at the matching ']' in one pass, ignoring any text after it
+    return _JSON_DECODER.raw_decode(text, start_idx)[0]
+
+def _build_prompt(requirement: str) -> str:
+    """Build the tech stack suggestion prompt for a requirement."""
+    return f"""
     Analyze the following requirement and suggest 3-4 different technology stack options:
     
     Requirement: {requirement}
@@ -78,18 +69,63 @@ def test_tech_stack_suggestion():
     
     Ensure the response is valid JSON without any additional text or formatting.
     """
+
+@lru_cache(maxsize=1)
+def _ai_engine() -> AIEngine:
+    """Engine shared by every tech stack request in this process."""
+    return AIEngine()
+
+def _cached_tech_stack(requirement: str, model: str) -> str:
+    """Ask the model for tech stack options; repeated requirements are answered from memory."""
+    key = (requirement, model)
+    if key in _tech_stack_cache:
+        _tech_stack_cache.move_to_end(key)
+        return _tech_stack_cache[key]
+    
+    response = _ai_engine().generate_response(_build_prompt(requirement), model=model)
+    
+    # Failures come back as error strings; keep them out so the next call retries
+    if not response.startswith("Error generating response"):
+        _tech_stack_cache[key] = response
+        if len(_tech_stack_cache) > TECH_STACK_CACHE_SIZE:
+            _tech_stack_cache.popitem(last=False)
+    return response
+
+def test_tech_stack_suggestion():
+    """Test the tech stack suggestion functionality"""
+    
+    print("🧪 Testing Tech Stack Suggestion")
+    print("=" * 50)
+    
+    # Initialize AI engine
+    _ai_engine()
+    
+    # Test requirement
+    requirement = """
+    Create a web application for managing a library system with the following features:
+    - User authentication and authorization
+    - Book catalog management (add, edit, delete, search)
+    - Borrowing and returning books
+    - Fine calculation for overdue books
+    - Admin dashboard with analytics
+    - RESTful API for mobile app integration
+    - Real-time notifications
+    - Report generation (PDF/Excel)
+    """
+    
+    print("📋 Test Requirement:")
+    print(requirement)
+    
+    # Test tech stack suggestion
+    print("\n🔍 Testing tech stack suggestion...")
     
     try:
-        response = ai_engine.generate_response(prompt, model="gpt-4o-mini")
+        response = _cached_tech_stack(requirement, "gpt-4o-mini")
         print("✅ AI Response received")
         
         # Try to parse JSON
-        import json
-        start_idx = response.find('[')
-        end_idx = response.rfind(']') + 1
-        if start_idx != -1 and end_idx != 0:
-            json_str = response[start_idx:end_idx]
-            tech_stacks = json.loads(json_str)
+        tech_stacks = _decode_json_array(response)
+        if tech_stacks is not None:
             print(f"✅ Successfully parsed {len(tech_stacks)} tech stack options")
             
             # Display tech stacks
@@ -1,13 +1,29 @@
 """
 Utility modules for the AI-powered development assistant.
+
+Utilities are imported on first access, so e.g. using FileManager does not
+load Jinja for TemplateManager.
 """
 
-from .file_manager import FileManager
-from .code_analyzer import CodeAnalyzer
-from .templates import TemplateManager
+import importlib
+
+_UTILITIES = {
+    'FileManager': '.file_manager',
+    'CodeAnalyzer': '.code_analyzer',
+    'TemplateManager': '.templates',
+    'get_template_manager': '.templates'
+}
 
 __all__ = [
     'FileManager',
     'CodeAnalyzer', 
-    'TemplateManager'
-] 
\ No newline at end of file
+    'TemplateManager',
+    'get_template_manager'
+]
+
+def __getattr__(name):
+    if name in _UTILITIES:
+        value = getattr(importlib.import_module(_UTILITIES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,10 +3,117 @@ Code Analyzer utility for analyzing code structure and complexity.
 """
 
 import ast
+import copy
 import re
-from typing import Dict, Any, List, Optional
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
+ANALYSIS_CACHE_SIZE = 256
+
+# Declaration patterns for languages analyzed without a parser
+_JS_FUNC_RE = re.compile(r'function\s+(\w+)')
+_C_FUNC_RE = re.compile(r'(\w+)\s+\w+\s*\([^)]*\)\s*{')
+_CLASS_RE = re.compile(r'class\s+(\w+)')
+
+def _count_comment_lines(code: str, prefixes: Tuple[str, ...]) -> int:
+    """Count lines whose first non-blank characters start with one of prefixes."""
+    comments = 0
+    for line in code.splitlines():
+        if line.lstrip().startswith(prefixes):
+            comments += 1
+    return comments
+
+class _PythonAnalyzer(ast.NodeVisitor):
+    """Collects metrics, structure and cyclomatic complexity in one pass over a tree."""
+    
+    def __init__(self):
+        self.metrics = {
+            "lines_of_code": 0,
+            "characters": 0,
+            "functions": 0,
+            "classes": 0,
+            "imports": 0,
+            "variables": 0,
+            "comments": 0,
+            "docstrings": 0,
+            "complexity_score": 0
+        }
+        self.structure = {
+            "functions": [],
+            "classes": [],
+            "imports": [],
+            "nested_levels": 0
+        }
+        # Bound once so each visit appends without looking the list up again
+        self._functions = self.structure["functions"]
+        self._classes = self.structure["classes"]
+        self._imports = self.structure["imports"]
+        # Number of enclosing functions; a decision point adds to each of their complexities
+        self._func_depth = 0
+    
+    def visit_Module(self, node: ast.Module):
+        self._count_docstring(node)
+        self.generic_visit(node)
+    
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        self._count_docstring(node)
+        self.metrics["functions"] += 1
+        self.metrics["complexity_score"] += 1  # Base complexity
+        self._functions.append({
+            "name": node.name,
+            "args": [arg.arg for arg in node.args.args],
+            "decorators": [d.id for d in node.decorator_list if isinstance(d, ast.Name)],
+            "line_count": len(node.body) if node.body else 0
+        })
+        
+        self._func_depth += 1
+        self.generic_visit(node)
+        self._func_depth -= 1
+    
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
+        self._count_docstring(node)
+        self.generic_visit(node)
+    
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self._count_docstring(node)
+        self.metrics["classes"] += 1
+        self._classes.append({
+            "name": node.name,
+            "bases": [base.id for base in node.bases if isinstance(base, ast.Name)],
+            "methods": [n.name for n in node.body if isinstance(n, ast.FunctionDef)],
+            "line_count": len(node.body)
+        })
+        self.generic_visit(node)
+    
+    def visit_Import(self, node: ast.Import):
+        self.metrics["imports"] += 1
+        self._imports.extend([alias.name for alias in node.names])
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        self.metrics["imports"] += 1
+        self._imports.append(f"{node.module}.{', '.join([alias.name for alias in node.names])}")
+    
+    def visit_Assign(self, node: ast.Assign):
+        self.metrics["variables"] += 1
+        self.generic_visit(node)
+    
+    def _count_docstring(self, node: ast.AST):
+        # Only a leading string in a module, class or function body is a docstring
+        if ast.get_docstring(node, clean=False) is not None:
+            self.metrics["docstrings"] += 1
+    
+    def _branch(self, node: ast.AST):
+        self.metrics["complexity_score"] += self._func_depth
+        self.generic_visit(node)
+    
+    visit_If = visit_While = visit_For = visit_AsyncFor = visit_ExceptHandler = _branch
+    
+    def visit_BoolOp(self, node: ast.BoolOp):
+        self.metrics["complexity_score"] += (len(node.values) - 1) * self._func_depth
+        self.generic_visit(node)
+
 class CodeAnalyzer:
     """Analyzes code structure, complexity, and quality metrics."""
     
@@ -16,9 +123,26 @@ class CodeAnalyzer:
             "medium": 10,
             "high": 20
         }
+        self._analysis_cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
     
-    def analyze_code(self, code: str, language: str = "python") -> Dict[str, Any]:
-        """Comprehensive code analysis."""
+    def analyze_code(self, code: str, language: str = "python",
+                     tree: Optional[ast.AST] = None) -> Dict[str, Any]:
+        """
+        Comprehensive code analysis.
+        
+        Callers that already parsed code can pass its tree to skip re-parsing.
+        Results are cached by code and language; each call gets its own copy.
+        """
+        key = (code, language)
+        with self._cache_lock:
+            cached = self._analysis_cache.get(key)
+            if cached is not None:
+                self._analysis_cache.move_to_end(key)
+        
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
         analysis = {
             "language": language,
             "metrics": {},
@@ -31,16 +155,22 @@ class CodeAnalyzer:
         
         try:
             if language.lower() == "python":
-                analysis.update(self._analyze_python_code(code))
+                analysis.update(self._analyze_python_code(code, tree))
             else:
                 analysis.update(self._analyze_generic_code(code, language))
                 
         except Exception as e:
             analysis["issues"].append(f"Analysis error: {e}")
         
+        stored = copy.deepcopy(analysis)
+        with self._cache_lock:
+            self._analysis_cache[key] = stored
+            self._analysis_cache.move_to_end(key)
+            if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
         return analysis
     
-    def _analyze_python_code(self, code: str) -> Dict[str, Any]:
+    def _analyze_python_code(self, code: str, tree: Optional[ast.AST] = None) -> Dict[str, Any]:
         """Analyze Python code specifically."""
         analysis = {
             "metrics": {},
@@ -50,13 +180,22 @@ class CodeAnalyzer:
         }
         
         try:
-            tree = ast.parse(code)
+            if tree is None:
+                tree = ast.parse(code)
+            
+            # Metrics, structure and per-function complexity in a single traversal
+            visitor = _PythonAnalyzer()
+            visitor.visit(tree)
             
             # Basic metrics
-            analysis["metrics"] = self._calculate_python_metrics(tree, code)
+            metrics = visitor.metrics
+            metrics["lines_of_code"] = code.count('\n') + 1
+            metrics["characters"] = len(code)
+            metrics["comments"] = _count_comment_lines(code, ('#',))
+            analysis["metrics"] = metrics
             
             # Code structure
-            analysis["structure"] = self._analyze_python_structure(tree)
+            analysis["structure"] = visitor.structure
             
             # Complexity analysis
             analysis["complexity"] = self._calculate_complexity(analysis["metrics"])
@@ -71,85 +210,6 @@ class CodeAnalyzer:
         
         return analysis
     
-    def _calculate_python_metrics(self, tree: ast.AST, code: str) -> Dict[str, Any]:
-        """Calculate Python-specific metrics."""
-        metrics = {
-            "lines_of_code": len(code.split('\n')),
-            "characters": len(code),
-            "functions": 0,
-            "classes": 0,
-            "imports": 0,
-            "variables": 0,
-            "comments": 0,
-            "docstrings": 0,
-            "complexity_score": 0
-        }
-        
-        # Count different elements
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                metrics["functions"] += 1
-                metrics["complexity_score"] += self._calculate_function_complexity(node)
-            elif isinstance(node, ast.ClassDef):
-                metrics["classes"] += 1
-            elif isinstance(node, (ast.Import, ast.ImportFrom)):
-                metrics["imports"] += 1
-            elif isinstance(node, ast.Assign):
-                metrics["variables"] += 1
-            elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Str):
-                metrics["docstrings"] += 1
-        
-        # Count comments
-        comment_lines = [line for line in code.split('\n') if line.strip().startswith('#')]
-        metrics["comments"] = len(comment_lines)
-        
-        return metrics
-    
-    def _analyze_python_structure(self, tree: ast.AST) -> Dict[str, Any]:
-        """Analyze Python code structure."""
-        structure = {
-            "functions": [],
-            "classes": [],
-            "imports": [],
-            "nested_levels": 0
-        }
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                structure["functions"].append({
-                    "name": node.name,
-                    "args": [arg.arg for arg in node.args.args],
-                    "decorators": [d.id for d in node.decorator_list if hasattr(d, 'id')],
-                    "line_count": len(node.body) if node.body else 0
-                })
-            elif isinstance(node, ast.ClassDef):
-                structure["classes"].append({
-                    "name": node.name,
-                    "bases": [base.id for base in node.bases if hasattr(base, 'id')],
-                    "methods": [n.name for n in node.body if isinstance(n, ast.FunctionDef)],
-                    "line_count": len(node.body)
-                })
-            elif isinstance(node, ast.Import):
-                structure["imports"].extend([alias.name for alias in node.names])
-            elif isinstance(node, ast.ImportFrom):
-                structure["imports"].append(f"{node.module}.{', '.join([alias.name for alias in node.names])}")
-        
-        return structure
-    
-    def _calculate_function_complexity(self, func_node: ast.FunctionDef) -> int:
-        """Calculate cyclomatic complexity of a function."""
-        complexity = 1  # Base complexity
-        
-        for node in ast.walk(func_node):
-            if isinstance(node, (ast.If, ast.While, ast.For, ast.AsyncFor)):
-                complexity += 1
-            elif isinstance(node, ast.ExceptHandler):
-                complexity += 1
-            elif isinstance(node, ast.BoolOp):
-                complexity += len(node.values) - 1
-        
-        return complexity
-    
     def _calculate_complexity(self, metrics: Dict[str, Any]) -> str:
         """Calculate overall complexity level."""
         total_complexity = metrics.get("complexity_score", 0)
@@ -163,30 +223,27 @@ class CodeAnalyzer:
     
     def _calculate_quality_score(self, analysis: Dict[str, Any]) -> float:
         """Calculate overall quality score (0-100)."""
-        score = 100.0
         metrics = analysis.get("metrics", {})
-        
-        # Penalize high complexity
         complexity_score = metrics.get("complexity_score", 0)
-        if complexity_score > 20:
-            score -= 20
-        elif complexity_score > 10:
-            score -= 10
-        
-        # Penalize lack of documentation
-        if metrics.get("docstrings", 0) == 0:
-            score -= 15
-        
-        # Penalize lack of comments
+        docstrings = metrics.get("docstrings", 0)
         comment_ratio = metrics.get("comments", 0) / max(metrics.get("lines_of_code", 1), 1)
-        if comment_ratio < 0.1:
-            score -= 10
+        
+        score = (
+            100.0
+            # Penalize high complexity
+            - (20 if complexity_score > 20 else 10 if complexity_score > 10 else 0)
+            # Penalize lack of documentation
+            - (15 if docstrings == 0 else 0)
+            # Penalize lack of comments
+            - (10 if comment_ratio < 0.1 else 0)
+        )
         
         # Penalize very long functions
-        functions = analysis.get("structure", {}).get("functions", [])
-        long_functions = sum(1 for f in functions if f.get("line_count", 0) > 20)
-        if long_functions > 0:
-            score -= long_functions * 5
+        long_functions = 0
+        for f in analysis.get("structure", {}).get("functions", []):
+            if f.get("line_count", 0) > 20:
+                long_functions += 1
+        score -= long_functions * 5
         
         return max(0, score)
     
@@ -194,9 +251,9 @@ class CodeAnalyzer:
         """Analyze generic code (non-Python)."""
         analysis = {
             "metrics": {
-                "lines_of_code": len(code.split('\n')),
+                "lines_of_code": code.count('\n') + 1,
                 "characters": len(code),
-                "comments": len([line for line in code.split('\n') if line.strip().startswith('//') or line.strip().startswith('/*')])
+                "comments": _count_comment_lines(code, ('//', '/*'))
             },
             "structure": {
                 "functions": [],
@@ -209,11 +266,11 @@ class CodeAnalyzer:
         
         # Basic pattern matching for common languages
         if language.lower() in ["javascript", "typescript"]:
-            analysis["structure"]["functions"] = re.findall(r'function\s+(\w+)', code)
-            analysis["structure"]["classes"] = re.findall(r'class\s+(\w+)', code)
+            analysis["structure"]["functions"] = _JS_FUNC_RE.findall(code)
+            analysis["structure"]["classes"] = _CLASS_RE.findall(code)
         elif language.lower() in ["java", "cpp", "c"]:
-            analysis["structure"]["functions"] = re.findall(r'(\w+)\s+\w+\s*\([^)]*\)\s*{', code)
-            analysis["structure"]["classes"] = re.findall(r'class\s+(\w+)', code)
+            analysis["structure"]["functions"] = _C_FUNC_RE.findall(code)
+            analysis["structure"]["classes"] = _CLASS_RE.findall(code)
         
         return analysis
     
@@ -4,11 +4,15 @@ File Manager utility for handling file operations.
 
 import os
 import json
-import zipfile
+import time
+from itertools import count
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any
 
+# Characters not allowed in file names, plus spaces, all become underscores
+_FILENAME_TRANS = str.maketrans({char: '_' for char in '<>:"/\\|?* '})
+
 class FileManager:
     """Manages file operations for generated code, tests, and other artifacts."""
     
@@ -17,6 +21,8 @@ class FileManager:
         self.code_dir = self.base_dir / "code"
         self.test_dir = self.base_dir / "tests"
         self.assessment_dir = self.base_dir / "assessments"
+        self._listing_stats: Dict[str, os.stat_result] = {}
+        self._seq = count()
         self._ensure_directories()
     
     def _ensure_directories(self):
@@ -24,28 +30,18 @@ class FileManager:
         for directory in [self.base_dir, self.code_dir, self.test_dir, self.assessment_dir]:
             directory.mkdir(parents=True, exist_ok=True)
     
+    def _timestamp(self) -> str:
+        """Timestamp for file names, with a sequence number so saves within a second don't collide."""
+        return f"{time.strftime('%Y%m%d_%H%M%S')}_{next(self._seq):04d}"
+    
     def _sanitize_filename(self, text: str, max_length: int = 100) -> str:
         """Sanitize text to create a valid filename."""
-        # Remove or replace invalid characters
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            text = text.replace(char, '_')
-        
-        # Replace spaces with underscores
-        text = text.replace(' ', '_')
-        
-        # Limit length
-        if len(text) > max_length:
-            text = text[:max_length]
-        
-        # Remove trailing underscores
-        text = text.rstrip('_')
-        
-        return text
+        # Replace invalid characters and spaces, limit length, drop trailing underscores
+        return text.translate(_FILENAME_TRANS)[:max_length].rstrip('_')
     
     def save_project_file(self, requirement: str, filename: str, content: str) -> str:
         """Save project file with proper extension based on filename."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = self._timestamp()
         sanitized_req = self._sanitize_filename(requirement[:50])
         
         # Determine the correct directory based on file type
@@ -63,38 +59,38 @@ class FileManager:
         full_filename = f"{timestamp}_{sanitized_req}_{filename}"
         file_path = directory / full_filename
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        file_path.write_text(content, encoding='utf-8')
+        self._forget_stat(file_path)
         
         return str(file_path)
     
     def save_code_file(self, requirement: str, code: str) -> str:
         """Save generated code to a file."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = self._timestamp()
         sanitized_req = self._sanitize_filename(requirement[:50])
         filename = f"{timestamp}_{sanitized_req}.py"
         file_path = self.code_dir / filename
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(code)
+        file_path.write_text(code, encoding='utf-8')
+        self._forget_stat(file_path)
         
         return str(file_path)
     
     def save_test_file(self, requirement: str, test_code: str) -> str:
         """Save generated test code to a file."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = self._timestamp()
         sanitized_req = self._sanitize_filename(requirement[:50])
         filename = f"test_{timestamp}_{sanitized_req}.py"
         file_path = self.test_dir / filename
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(test_code)
+        file_path.write_text(test_code, encoding='utf-8')
+        self._forget_stat(file_path)
         
         return str(file_path)
     
     def save_assessment_file(self, requirement: str, assessment: Dict[str, Any]) -> str:
         """Save deployment assessment to a file."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = self._timestamp()
         sanitized_req = self._sanitize_filename(requirement[:50])
         filename = f"assessment_{timestamp}_{sanitized_req}.json"
         file_path = self.assessment_dir / filename
@@ -106,14 +102,15 @@ class FileManager:
             "assessment": assessment
         }
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(assessment_data, f, indent=2, ensure_ascii=False)
+        # Written compactly; indented output is several times slower to serialize
+        file_path.write_text(json.dumps(assessment_data, separators=(",", ":"), ensure_ascii=False), encoding='utf-8')
+        self._forget_stat(file_path)
         
         return str(file_path)
     
     def save_project_structure_file(self, requirement: str, project_structure: Dict[str, Any]) -> str:
         """Save project structure to a file."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = self._timestamp()
         sanitized_req = self._sanitize_filename(requirement[:50])
         filename = f"project_structure_{timestamp}_{sanitized_req}.json"
         file_path = self.assessment_dir / filename
@@ -125,32 +122,44 @@ class FileManager:
             "project_structure": project_structure
         }
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(structure_data, f, indent=2, ensure_ascii=False)
+        file_path.write_text(json.dumps(structure_data, separators=(",", ":"), ensure_ascii=False), encoding='utf-8')
+        self._forget_stat(file_path)
         
         return str(file_path)
     
     def list_generated_files(self) -> Dict[str, List[str]]:
         """List all generated files organized by type."""
-        files = {
-            "code": [],
-            "tests": [],
-            "assessments": []
-        }
-        
-        # List code files
-        for file_path in self.code_dir.glob("*.py"):
-            files["code"].append(str(file_path))
+        # Stats from this listing let get_file_info skip a second stat per file
+        self._listing_stats = {}
         
-        # List test files
-        for file_path in self.test_dir.glob("*.py"):
-            files["tests"].append(str(file_path))
-        
-        # List assessment files
-        for file_path in self.assessment_dir.glob("*.json"):
-            files["assessments"].append(str(file_path))
-        
-        return files
+        return {
+            "code": self._scan_files(self.code_dir, ".py"),
+            "tests": self._scan_files(self.test_dir, ".py"),
+            "assessments": self._scan_files(self.assessment_dir, ".json")
+        }
+    
+    def _scan_files(self, directory: Path, suffix: str) -> List[str]:
+        """List files in directory with the given suffix, recording their stats."""
+        paths = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.') or not entry.name.endswith(suffix) or not entry.is_file():
+                        continue
+                    path = str(directory / entry.name)
+                    self._listing_stats[path] = entry.stat()
+                    paths.append(path)
+        except FileNotFoundError:
+            pass
+        return paths
+    
+    def _stat(self, file_path: str) -> os.stat_result:
+        """Stat a file, reusing the result recorded by the last listing when available."""
+        return self._listing_stats.get(str(file_path)) or os.stat(file_path)
+    
+    def _forget_stat(self, file_path: Any):
+        """Drop a listed file's recorded stat after this manager writes or deletes it."""
+        self._listing_stats.pop(str(file_path), None)
     
     def get_file_contents(self, file_path: str) -> str:
         """Get contents of a file."""
@@ -163,7 +172,7 @@ class FileManager:
     def get_file_size(self, file_path: str) -> str:
         """Get human-readable file size."""
         try:
-            size_bytes = os.path.getsize(file_path)
+            size_bytes = os.stat(file_path).st_size
             if size_bytes < 1024:
                 return f"{size_bytes} B"
             elif size_bytes < 1024 * 1024:
@@ -175,37 +184,43 @@ class FileManager:
     
     def create_zip_archive(self, file_list: List[Dict[str, Any]]) -> str:
         """Create a ZIP archive of all generated files."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        import zipfile
+        
+        timestamp = self._timestamp()
         zip_filename = f"generated_files_{timestamp}.zip"
         zip_path = self.base_dir / zip_filename
         
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        # Level 1 deflate is much faster than the default and compresses source code nearly as well
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
             for file_info in file_list:
-                if os.path.exists(file_info['path']):
-                    # Add file to zip with relative path
-                    arcname = f"{file_info['type']}/{os.path.basename(file_info['path'])}"
+                # Add file to zip with relative path, skipping files that no longer exist
+                arcname = f"{file_info['type']}/{os.path.basename(file_info['path'])}"
+                try:
                     zipf.write(file_info['path'], arcname)
+                except FileNotFoundError:
+                    continue
         
         return str(zip_path)
     
     def cleanup_old_files(self, days_old: int = 7):
         """Clean up files older than specified days."""
-        cutoff_time = datetime.now().timestamp() - (days_old * 24 * 60 * 60)
+        cutoff_time = time.time() - (days_old * 24 * 60 * 60)
         
         for directory in [self.code_dir, self.test_dir, self.assessment_dir]:
-            for file_path in directory.iterdir():
-                if file_path.is_file():
-                    file_time = file_path.stat().st_mtime
-                    if file_time < cutoff_time:
+            # DirEntry knows the file type from the listing, leaving one stat per file
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff_time:
                         try:
-                            file_path.unlink()
+                            os.unlink(entry.path)
+                            self._forget_stat(entry.path)
                         except Exception as e:
-                            print(f"Error deleting {file_path}: {e}")
+                            print(f"Error deleting {entry.path}: {e}")
     
     def get_file_info(self, file_path: str) -> Dict[str, Any]:
         """Get detailed information about a file."""
         try:
-            stat = os.stat(file_path)
+            stat = self._stat(file_path)
             return {
                 "name": os.path.basename(file_path),
                 "path": file_path,
@@ -0,0 +1,44 @@
+"""
+Combined code analysis and deployment assessment from a single parse.
+"""
+
+import ast
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+from core.deploy_checker import DeployChecker
+from .code_analyzer import CodeAnalyzer
+
+@dataclass
+class CodeReport:
+    """Analysis and deployment assessment of the same code."""
+    analysis: Dict[str, Any]
+    assessment: Dict[str, Any]
+
+def analyze_and_assess(code: str, tests: str, language: str = "python",
+                       analyzer: Optional[CodeAnalyzer] = None,
+                       checker: Optional[DeployChecker] = None) -> CodeReport:
+    """
+    Analyze code and assess its deployment readiness, parsing it only once.
+
+    Args:
+        code: Source code to analyze
+        tests: Test code used by the deployment assessment
+        language: Programming language of the code
+        analyzer: CodeAnalyzer to use; a new one is created if omitted
+        checker: DeployChecker to use; a new one is created if omitted
+    """
+    analyzer = analyzer or CodeAnalyzer()
+    checker = checker or DeployChecker()
+
+    tree = None
+    if language.lower() == "python":
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            pass  # Each side reports syntax errors in its own format
+
+    return CodeReport(
+        analysis=analyzer.analyze_code(code, language, tree=tree),
+        assessment=checker.assess_deployment_readiness(code, tests, language, tree=tree)
+    )
@@ -0,0 +1,97 @@
+"""
+Disk-backed memoization for expensive, deterministic generation calls.
+"""
+
+import os
+import json
+import time
+import pickle
+import hashlib
+import logging
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+CACHE_DIR = Path(os.getenv('MEMO_CACHE_DIR', 'generated/.cache'))
+
+# When False, cached entries are ignored (but still refreshed) so results are regenerated
+read_cache = True
+
+def _cache_key(key: Any) -> str:
+    """Hash a JSON-serializable key into a stable cache file name."""
+    payload = json.dumps(key, sort_keys=True, default=repr)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+def _succeeded(result: Any) -> bool:
+    """Default cache_if: keep anything but a result dict reporting failure."""
+    return not (isinstance(result, dict) and (result.get("success") is False or "error" in result))
+
+def _files_exist(result: Any) -> bool:
+    """Whether every file a cached result dict points at is still on disk."""
+    if not isinstance(result, dict):
+        return True
+    return all(
+        Path(result[name]).exists()
+        for name in ("file_path", "test_file_path")
+        if isinstance(result.get(name), str)
+    )
+
+def get_or_compute(namespace: str, key: Any, compute: Callable[[], Any],
+                   ttl: Optional[float] = None,
+                   cache_if: Callable[[Any], bool] = _succeeded) -> Any:
+    """
+    Return the cached result for key, or compute, store and return it.
+
+    Args:
+        namespace: Sub-directory separating caches of different stages
+        key: JSON-serializable value identifying the computation
+        compute: Zero-argument callable producing the result
+        ttl: Seconds a cached result stays valid; None keeps it forever
+        cache_if: Predicate deciding whether a computed result is stored
+    """
+    # Hash the key once and use it for both the lookup and the store
+    digest = _cache_key(key)
+    path = CACHE_DIR / namespace / digest[:2] / digest
+
+    if read_cache:
+        try:
+            if ttl is None or time.time() - path.stat().st_mtime < ttl:
+                cached = pickle.loads(path.read_bytes())
+                # A result whose saved file was since deleted is recomputed
+                if _files_exist(cached):
+                    return cached
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable cache entry {path}: {e}")
+
+    result = compute()
+
+    # Failures are worth retrying, so only successful results are kept
+    if not cache_if(result):
+        return result
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(pickle.dumps(result))
+    except Exception as e:
+        logging.warning(f"Could not write cache entry {path}: {e}")
+
+    return result
+
+def memoize(namespace: str, ttl: Optional[float] = None,
+            cache_if: Callable[[Any], bool] = _succeeded) -> Callable:
+    """
+    Cache a function's results on disk, keyed by its arguments.
+
+    Args:
+        namespace: Sub-directory separating caches of different functions
+        ttl: Seconds a cached result stays valid; None keeps it forever
+        cache_if: Predicate deciding whether a computed result is stored
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            return get_or_compute(namespace, [args, kwargs], lambda: func(*args, **kwargs), ttl, cache_if)
+        return wrapper
+    return decorator
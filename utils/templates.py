@@ -3,18 +3,135 @@ Template Manager utility for handling code templates.
 """
 
 import os
-from typing import Dict, Any, List, Optional
+import re
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
-from jinja2 import Template, Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, ChoiceLoader, DictLoader, TemplateError
+
+TEMPLATE_DIR = Path("templates")
+JINJA_CACHE_DIR = Path(os.getenv('JINJA_CACHE_DIR', 'generated/.jinja_cache'))
+RENDER_CACHE_SIZE = 256
+
+# Characters dropped from requirement text before building a class name
+_CLASS_NAME_CLEAN_RE = re.compile(r'[^a-zA-Z0-9\s]')
+# The same cleaning as a translation table, for the common all-ASCII case
+_CLASS_NAME_TRANS = str.maketrans('', '', ''.join(
+    chr(c) for c in range(128) if not (chr(c).isalnum() or chr(c).isspace())
+))
+
+# Shared default for renders without dependencies
+_NO_DEPENDENCIES = ()
+
+# Written once the defaults exist, so later managers skip checking each file
+_BOOTSTRAP_SENTINEL = ".bootstrapped_v1"
+
+# Render memo and built-in source checks, shared like the environments so a
+# template written through any manager invalidates them for all of them
+_render_cache: "OrderedDict[Tuple, str]" = OrderedDict()
+_builtin: Dict[str, bool] = {}
+_render_cache_lock = threading.Lock()
+
+# Jinja environments created so far, by dev_mode
+_environments: Dict[bool, Environment] = {}
+_environments_lock = threading.Lock()
+
+def _environment(dev_mode: bool = False) -> Environment:
+    """
+    Shared Jinja environment for all TemplateManager instances.
+    
+    Compiled templates are kept in memory for the life of the process and
+    as bytecode on disk, so a fresh process skips lexing and parsing too.
+    Outside dev_mode templates are not re-checked on disk for changes;
+    create_custom_template drops every environment's in-memory cache when
+    it writes one.
+    """
+    with _environments_lock:
+        env = _environments.get(dev_mode)
+        if env is None:
+            env = _environments[dev_mode] = _create_environment(dev_mode)
+        return env
+
+def _create_environment(dev_mode: bool) -> Environment:
+    """Build a Jinja environment and compile the default templates into it."""
+    try:
+        JINJA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(str(JINJA_CACHE_DIR))
+    except OSError as e:
+        logging.warning(f"Jinja bytecode cache disabled, cannot use {JINJA_CACHE_DIR}: {e}")
+        bytecode_cache = None
+    
+    env = Environment(
+        # Files on disk win so edited templates are used; the built-in
+        # defaults cover any that are missing or could not be written
+        loader=ChoiceLoader([
+            FileSystemLoader(str(TEMPLATE_DIR)),
+            DictLoader(_DEFAULT_TEMPLATES)
+        ]),
+        bytecode_cache=bytecode_cache,
+        cache_size=-1,
+        auto_reload=dev_mode
+    )
+    
+    # Compile the defaults up front so the first render doesn't pay for it
+    for name in _DEFAULT_TEMPLATES:
+        try:
+            env.get_template(name)
+        except TemplateError:
+            pass  # Reported by render_template when the template is used
+    return env
+
+def _write_atomic(path: Path, content: str):
+    """Write a file in one buffered write and publish it with a rename, so readers never see it half-written."""
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'w', buffering=65536, encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+@lru_cache(maxsize=512)
+def _class_name(requirement: str) -> str:
+    """Class name for a requirement; cached because its code and test renders share it."""
+    # Clean the requirement text
+    if requirement.isascii():
+        clean_text = requirement.translate(_CLASS_NAME_TRANS)
+    else:
+        clean_text = _CLASS_NAME_CLEAN_RE.sub('', requirement)
+    words = clean_text.split()
+    
+    if not words:
+        return "RequirementImplementation"
+    
+    # Capitalize first letter of each word and join
+    class_name = ''.join(word.capitalize() for word in words[:3])  # Limit to 3 words
+    
+    # Ensure it starts with a letter
+    if not class_name[0].isalpha():
+        class_name = "Requirement" + class_name
+    
+    return class_name + "Implementation"
+
+@lru_cache(maxsize=1)
+def get_template_manager() -> "TemplateManager":
+    """Process-wide TemplateManager, so the template directory is bootstrapped once."""
+    return TemplateManager()
 
 class TemplateManager:
     """Manages code templates and template rendering."""
     
-    def __init__(self):
-        self.template_dir = Path("templates")
-        self.env = Environment(loader=FileSystemLoader(str(self.template_dir)))
+    def __init__(self, dev_mode: bool = False):
+        self.template_dir = TEMPLATE_DIR
+        # In dev mode template edits on disk are picked up at every render
+        self.dev_mode = dev_mode
+        self._template_list: List[str] = []
+        self._template_list_mtime: Optional[int] = None
         self._ensure_template_dir()
         self._create_default_templates()
+        # Created after the defaults are on disk, so they load from their files
+        self.env = _environment(dev_mode)
     
     def _ensure_template_dir(self):
         """Ensure template directory exists."""
@@ -22,21 +139,198 @@ class TemplateManager:
     
     def _create_default_templates(self):
         """Create default templates if they don't exist."""
-        default_templates = {
-            "python_template.py": self._get_python_template(),
-            "test_template.py": self._get_test_template(),
-            "requirements_template.txt": self._get_requirements_template()
-        }
+        sentinel = self.template_dir / _BOOTSTRAP_SENTINEL
+        if sentinel.exists():
+            return
         
-        for filename, content in default_templates.items():
+        for filename, content in _DEFAULT_TEMPLATES.items():
             template_path = self.template_dir / filename
             if not template_path.exists():
-                with open(template_path, 'w') as f:
-                    f.write(content)
+                _write_atomic(template_path, content)
+        sentinel.touch()
+    
+    def render_template(self, template_name: str, context: Dict[str, Any],
+                        memoize: bool = True) -> str:
+        """
+        Render a template with the given context.
+        
+        Renders are memoized with the timestamp bucketed to the day, so the
+        same requirement rendered again that day returns the first render;
+        pass memoize=False when the exact timestamp matters.
+        Errors propagate; use safe_render_template to get a message instead.
+        """
+        key = None if self.dev_mode or not memoize else self._render_key(template_name, context)
+        if key is not None:
+            with _render_cache_lock:
+                cached = _render_cache.get(key)
+                if cached is not None:
+                    _render_cache.move_to_end(key)
+            if cached is not None:
+                return cached
+        
+        rendered = self.env.get_template(template_name).render(**context)
+        
+        if key is not None:
+            with _render_cache_lock:
+                _render_cache[key] = rendered
+                _render_cache.move_to_end(key)
+                if len(_render_cache) > RENDER_CACHE_SIZE:
+                    _render_cache.popitem(last=False)
+        return rendered
+    
+    def safe_render_template(self, template_name: str, context: Dict[str, Any],
+                             memoize: bool = True) -> str:
+        """Render a template, returning an error message instead of raising."""
+        try:
+            return self.render_template(template_name, context, memoize)
+        except Exception as e:
+            return f"Error rendering template {template_name}: {e}"
+    
+    def render_to_file(self, template_name: str, context: Dict[str, Any], path: str) -> bool:
+        """Render a template straight to a file, streaming it instead of building the whole string."""
+        try:
+            self.env.get_template(template_name).stream(**context).dump(str(path), encoding='utf-8')
+            return True
+        except Exception as e:
+            logging.error(f"Error rendering template {template_name} to {path}: {e}")
+            return False
+    
+    def _render_key(self, template_name: str, context: Dict[str, Any]) -> Optional[Tuple]:
+        """Build a hashable cache key for a render, or None if the context can't be keyed."""
+        items = []
+        for name, value in sorted(context.items()):
+            if name == "timestamp":
+                value = str(value)[:10]  # YYYY-MM-DD
+            elif isinstance(value, list):
+                value = tuple(value)
+            items.append((name, value))
+        
+        key = (template_name, tuple(items))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
     
-    def _get_python_template(self) -> str:
-        """Get default Python code template."""
-        return '''"""
+    def get_available_templates(self) -> List[str]:
+        """Get list of available templates."""
+        # The listing only changes when an entry is added, removed or renamed,
+        # all of which bump the directory's mtime
+        mtime = self.template_dir.stat().st_mtime_ns
+        if mtime != self._template_list_mtime:
+            with os.scandir(self.template_dir) as entries:
+                self._template_list = [entry.name for entry in entries if not entry.name.startswith('.') and entry.is_file()]
+            self._template_list_mtime = mtime
+        return list(self._template_list)
+    
+    def create_custom_template(self, name: str, content: str) -> bool:
+        """Create a custom template."""
+        try:
+            template_path = self.template_dir / name
+            _write_atomic(template_path, content)
+            with _environments_lock:
+                for env in _environments.values():
+                    env.cache.clear()
+            with _render_cache_lock:
+                _render_cache.clear()
+            _builtin.clear()
+            return True
+        except Exception:
+            return False
+    
+    def get_template_content(self, template_name: str) -> str:
+        """Get the content of a template."""
+        try:
+            return (self.template_dir / template_name).read_bytes().decode('utf-8')
+        except Exception:
+            return f"Template {template_name} not found"
+    
+    def render_code_template(self, requirement: str, language: str = "python", 
+                           dependencies: List[str] = None,
+                           timestamp: Optional[str] = None) -> str:
+        """
+        Render a code template for the given requirement.
+        
+        Pass the same timestamp to the test template when rendering both for
+        one requirement, so the pair is stamped identically.
+        """
+        # Other languages get a fixed stub, so skip building a context for them
+        if language.lower() != "python":
+            return f"# {language} code for: {requirement}\n# TODO: Implement based on requirement"
+        
+        # An explicit timestamp must appear as given, not as a same-day memoized render
+        context = self._build_context(requirement, language, dependencies, timestamp)
+        return self.safe_render_template("python_template.py", context, memoize=timestamp is None)
+    
+    def render_test_template(self, requirement: str, language: str = "python",
+                           dependencies: List[str] = None,
+                           timestamp: Optional[str] = None) -> str:
+        """Render a test template for the given requirement."""
+        if language.lower() != "python":
+            return f"# {language} tests for: {requirement}\n# TODO: Implement test cases"
+        
+        context = self._build_context(requirement, language, dependencies, timestamp)
+        return self.safe_render_template("test_template.py", context, memoize=timestamp is None)
+    
+    def render_bundle(self, requirement: str, language: str = "python",
+                      dependencies: List[str] = None) -> Dict[str, str]:
+        """Render code, tests and requirements for a requirement from one shared context."""
+        if language.lower() != "python":
+            return {
+                "code": self.render_code_template(requirement, language, dependencies),
+                "tests": self.render_test_template(requirement, language, dependencies),
+                "requirements": self.render_requirements_template(requirement, dependencies)
+            }
+        
+        context = self._build_context(requirement, language, dependencies)
+        return {
+            "code": self.safe_render_template("python_template.py", context),
+            "tests": self.safe_render_template("test_template.py", context),
+            "requirements": self.safe_render_template("requirements_template.txt", context)
+        }
+    
+    def _build_context(self, requirement: str, language: str, dependencies: Optional[List[str]],
+                       timestamp: Optional[str] = None) -> Dict[str, Any]:
+        """Build the render context shared by the code, test and requirements templates."""
+        return {
+            "requirement": requirement,
+            "language": language,
+            "class_name": self._generate_class_name(requirement),
+            "timestamp": timestamp or datetime.now().isoformat(),
+            "dependencies": dependencies or _NO_DEPENDENCIES
+        }
+    
+    def render_requirements_template(self, requirement: str, 
+                                   dependencies: List[str] = None) -> str:
+        """Render a requirements template."""
+        if not self.dev_mode and self._is_builtin("requirements_template.txt"):
+            # The built-in template is a fixed header, one line per dependency and
+            # a fixed footer, so it is assembled directly instead of through Jinja
+            lines = ''.join(f"\n{dep}\n" for dep in dependencies or _NO_DEPENDENCIES)
+            return _REQ_HEADER.replace("{{ requirement }}", str(requirement)) + lines + _REQ_FOOTER
+        
+        context = {
+            "requirement": requirement,
+            "dependencies": dependencies or _NO_DEPENDENCIES
+        }
+        
+        return self.safe_render_template("requirements_template.txt", context)
+    
+    def _is_builtin(self, template_name: str) -> bool:
+        """Whether template_name resolves to its unmodified built-in source."""
+        if template_name not in _builtin:
+            try:
+                source = self.env.loader.get_source(self.env, template_name)[0]
+            except TemplateError:
+                source = None
+            _builtin[template_name] = source == _DEFAULT_TEMPLATES.get(template_name)
+        return _builtin[template_name]
+    
+    def _generate_class_name(self, requirement: str) -> str:
+        """Generate a class name from requirement text."""
+        return _class_name(requirement)
+
+_PY_TPL = '''"""
 Generated Python code for: {{ requirement }}
 
 Generated on: {{ timestamp }}
@@ -44,6 +338,7 @@ Language: {{ language }}
 """
 
 import logging
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 import os
 from pathlib import Path
@@ -60,6 +355,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1)
+def _default_config() -> Dict[str, Any]:
+    """Read default configuration from the environment once per process."""
+    return {
+        "debug": os.getenv("DEBUG", "False").lower() == "true",
+        "log_level": os.getenv("LOG_LEVEL", "INFO"),
+        "timeout": int(os.getenv("TIMEOUT", "30"))
+    }
+
 class {{ class_name }}:
     """
     Implementation for: {{ requirement }}
@@ -77,11 +381,8 @@ class {{ class_name }}:
     
     def _load_default_config(self) -> Dict[str, Any]:
         """Load default configuration."""
-        return {
-            "debug": os.getenv("DEBUG", "False").lower() == "true",
-            "log_level": os.getenv("LOG_LEVEL", "INFO"),
-            "timeout": int(os.getenv("TIMEOUT", "30"))
-        }
+        # Copy so per-instance changes don't leak into the shared defaults
+        return dict(_default_config())
     
     def process_requirement(self, input_data: Any) -> Dict[str, Any]:
         """
@@ -157,10 +458,8 @@ def main():
 if __name__ == "__main__":
     main()
 '''
-    
-    def _get_test_template(self) -> str:
-        """Get default test template."""
-        return '''"""
+
+_TEST_TPL = '''"""
 Generated test cases for: {{ requirement }}
 
 Generated on: {{ timestamp }}
@@ -298,10 +597,8 @@ def mock_config():
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 '''
-    
-    def _get_requirements_template(self) -> str:
-        """Get default requirements template."""
-        return '''# Requirements for: {{ requirement }}
+
+_REQ_TPL = '''# Requirements for: {{ requirement }}
 
 # Core dependencies
 {% for dep in dependencies %}
@@ -320,106 +617,14 @@ mypy>=1.0.0
 # pandas>=1.5.0
 # numpy>=1.24.0
 '''
-    
-    def render_template(self, template_name: str, context: Dict[str, Any]) -> str:
-        """Render a template with the given context."""
-        try:
-            template = self.env.get_template(template_name)
-            return template.render(**context)
-        except Exception as e:
-            return f"Error rendering template {template_name}: {e}"
-    
-    def get_available_templates(self) -> List[str]:
-        """Get list of available templates."""
-        return [f.name for f in self.template_dir.glob("*") if f.is_file()]
-    
-    def create_custom_template(self, name: str, content: str) -> bool:
-        """Create a custom template."""
-        try:
-            template_path = self.template_dir / name
-            with open(template_path, 'w') as f:
-                f.write(content)
-            return True
-        except Exception:
-            return False
-    
-    def get_template_content(self, template_name: str) -> str:
-        """Get the content of a template."""
-        try:
-            template_path = self.template_dir / template_name
-            with open(template_path, 'r') as f:
-                return f.read()
-        except Exception:
-            return f"Template {template_name} not found"
-    
-    def render_code_template(self, requirement: str, language: str = "python", 
-                           dependencies: List[str] = None) -> str:
-        """Render a code template for the given requirement."""
-        from datetime import datetime
-        
-        # Generate class name from requirement
-        class_name = self._generate_class_name(requirement)
-        
-        context = {
-            "requirement": requirement,
-            "language": language,
-            "class_name": class_name,
-            "timestamp": datetime.now().isoformat(),
-            "dependencies": dependencies or []
-        }
-        
-        if language.lower() == "python":
-            return self.render_template("python_template.py", context)
-        else:
-            return f"# {language} code for: {requirement}\n# TODO: Implement based on requirement"
-    
-    def render_test_template(self, requirement: str, language: str = "python",
-                           dependencies: List[str] = None) -> str:
-        """Render a test template for the given requirement."""
-        from datetime import datetime
-        
-        # Generate class name from requirement
-        class_name = self._generate_class_name(requirement)
-        
-        context = {
-            "requirement": requirement,
-            "language": language,
-            "class_name": class_name,
-            "timestamp": datetime.now().isoformat(),
-            "dependencies": dependencies or []
-        }
-        
-        if language.lower() == "python":
-            return self.render_template("test_template.py", context)
-        else:
-            return f"# {language} tests for: {requirement}\n# TODO: Implement test cases"
-    
-    def render_requirements_template(self, requirement: str, 
-                                   dependencies: List[str] = None) -> str:
-        """Render a requirements template."""
-        context = {
-            "requirement": requirement,
-            "dependencies": dependencies or []
-        }
-        
-        return self.render_template("requirements_template.txt", context)
-    
-    def _generate_class_name(self, requirement: str) -> str:
-        """Generate a class name from requirement text."""
-        import re
-        
-        # Clean the requirement text
-        clean_text = re.sub(r'[^a-zA-Z0-9\s]', '', requirement)
-        words = clean_text.split()
-        
-        if not words:
-            return "RequirementImplementation"
-        
-        # Capitalize first letter of each word and join
-        class_name = ''.join(word.capitalize() for word in words[:3])  # Limit to 3 words
-        
-        # Ensure it starts with a letter
-        if not class_name[0].isalpha():
-            class_name = "Requirement" + class_name
-        
-        return class_name + "Implementation" 
\ No newline at end of file
+
+# Built-in templates, written to TEMPLATE_DIR when missing
+_DEFAULT_TEMPLATES = {
+    "python_template.py": _PY_TPL,
+    "test_template.py": _TEST_TPL,
+    "requirements_template.txt": _REQ_TPL
+}
+
+# Fixed text around the requirements template's dependency loop, for rendering it without Jinja
+_REQ_HEADER, _, _REQ_FOOTER = _REQ_TPL.partition("{% for dep in dependencies %}\n{{ dep }}\n{% endfor %}")
+_REQ_FOOTER = _REQ_FOOTER[:-1]  # Jinja drops the template's final newline